@@ -1,15 +1,43 @@
 #!/usr/bin/env python3
 """
-Simple ZMQ PUB demo to send scene JSON periodically.
+Simple ZMQ PUB demo to send scenes periodically.
 Save as: pub.py
-Usage: python pub.py
+Usage: python pub.py [--format json|msgpack|v3d1]
+
+Each message is two frames: [topic, payload]. The payload is an array of
+BATCH consecutive scenes; subscribers display the latest one.
+
+Formats:
+- json:    scenes in the documented JSON layout (points / segments dicts)
+- msgpack: each scene is a map of raw little-endian column buffers
+           (xyz/sizes/seg_* float32, rgba/seg_rgba uint8) plus counts n/m,
+           so the subscriber can view them as NumPy arrays without parsing
+- v3d1:    one binary record per scene, back to back: b'V3D1', '<II' point /
+           segment counts, float32 xyz, sizes, seg_start, seg_end, seg_widths,
+           then uint8 rgba, seg_rgba (no dependency beyond NumPy)
 """
+import argparse
 import time
-import json
 import zmq
 
+from v3d import _json
+from v3d.codec import encode_msgpack, encode_v3d1, msgpack
+
+TOPIC = b'scene'
+BATCH = 16      # scenes (ticks) coalesced into one message
+PERIOD = 0.2    # seconds between messages
+
+
+parser = argparse.ArgumentParser(description='Publish demo scenes over ZMQ')
+parser.add_argument('--format', choices=('json', 'msgpack', 'v3d1'), default='json')
+args = parser.parse_args()
+if args.format == 'msgpack' and msgpack is None:
+    parser.error('msgpack is not installed (pip install msgpack)')
+
 ctx = zmq.Context()
 sock = ctx.socket(zmq.PUB)
+# never drop queued scenes on the publisher side under bursts
+sock.setsockopt(zmq.SNDHWM, 0)
 sock.bind('tcp://127.0.0.1:5556')
 
 print('Publisher bound to tcp://127.0.0.1:5556')
@@ -19,19 +47,27 @@ time.sleep(0.2)
 try:
     t = 0
     while True:
-        pts = [
-            {"x": 2.0 * (i % 5) + (t % 5) * 0.1, "y": (i // 5) * 1.5, "z": (i % 3) * 0.7, "size": 6, "color": [1, 0, 0, 1]} 
-            for i in range(10)
-        ]
-        segs = [
-            {"start": [0,0,0], "end": [t*0.05, 0.5, 0.2], "color": [0,1,0,1], "width": 2}
-        ]
-        msg = {"points": pts, "segments": segs}
-        sock.send_string(json.dumps(msg))
-        t += 1
-        time.sleep(0.2)
+        batch = []
+        for _ in range(BATCH):
+            pts = [
+                {"x": 2.0 * (i % 5) + (t % 5) * 0.1, "y": (i // 5) * 1.5, "z": (i % 3) * 0.7, "size": 6, "color": [1, 0, 0, 1]}
+                for i in range(10)
+            ]
+            segs = [
+                {"start": [0,0,0], "end": [t*0.05, 0.5, 0.2], "color": [0,1,0,1], "width": 2}
+            ]
+            batch.append({"points": pts, "segments": segs})
+            t += 1
+            time.sleep(PERIOD / BATCH)
+        if args.format == 'msgpack':
+            payload = encode_msgpack(batch)
+        elif args.format == 'v3d1':
+            payload = encode_v3d1(batch)
+        else:
+            payload = _json.dumpb(batch)
+        sock.send_multipart([TOPIC, payload], copy=False)
 except KeyboardInterrupt:
     print('Stopping publisher')
 finally:
     sock.close()
-    ctx.term()
\ No newline at end of file
+    ctx.term()
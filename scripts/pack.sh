@@ -23,7 +23,7 @@ PYI_ARGS=(--onefile --noconfirm --clean --name ${APP_NAME})
 PYI_ARGS+=(--hidden-import=vtkmodules)
 PYI_ARGS+=(--hidden-import=vtkmodules.qt.QVTKRenderWindowInteractor)
 PYI_ARGS+=(--hidden-import=vtkmodules.util.numpy_support)
-PYI_ARGS+=(--hidden-import=vtkmodules.all)
+PYI_ARGS+=(--hidden-import=vtkmodules.vtkRenderingOpenGL2)
 
 case "${PLATFORM}" in
   linux|macos)
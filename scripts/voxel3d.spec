@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['vtkmodules', 'vtkmodules.qt.QVTKRenderWindowInteractor', 'vtkmodules.util.numpy_support', 'vtkmodules.all'],
+    hiddenimports=['vtkmodules', 'vtkmodules.qt.QVTKRenderWindowInteractor', 'vtkmodules.util.numpy_support', 'vtkmodules.vtkRenderingOpenGL2'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from v3d import codec
+from v3d.scene_model import SceneModel
+
+needs_msgpack = pytest.mark.skipif(codec.msgpack is None, reason='msgpack is not installed')
+
+
+def _scene(n_points=6, n_segments=3):
+    m = SceneModel()
+    m.randomize(n_points=n_points, n_segments=n_segments)
+    return m
+
+
+def _from_kwargs(kwargs):
+    m = SceneModel()
+    m.set_from_arrays(**kwargs)
+    return m
+
+
+def _assert_same(a, b):
+    assert a.counts == b.counts
+    assert np.array_equal(a.xyz, b.xyz)
+    assert np.array_equal(a.sizes, b.sizes)
+    assert np.allclose(a.colors, b.colors, atol=1 / 255)
+    assert np.array_equal(a.seg_start, b.seg_start)
+    assert np.array_equal(a.seg_end, b.seg_end)
+    assert np.allclose(a.seg_colors, b.seg_colors, atol=1 / 255)
+    assert np.array_equal(a.seg_widths, b.seg_widths)
+
+
+@needs_msgpack
+def test_msgpack_round_trip():
+    src = _scene()
+    _assert_same(_from_kwargs(codec.decode_msgpack(codec.encode_msgpack(src))), src)
+    # scene dicts pack the same way; a list packs as a batch
+    batch = [src.to_dict(), _scene(2, 0).to_dict()]
+    decoded = codec.decode_msgpack(codec.encode_msgpack(batch))
+    assert isinstance(decoded, list) and len(decoded) == 2
+    _assert_same(_from_kwargs(decoded[0]), src)
+    assert _from_kwargs(decoded[1]).counts == (2, 0)
+
+
+@needs_msgpack
+def test_msgpack_malformed_payload_raises_value_error():
+    packed = codec.pack_scene(_scene())
+    missing = dict(packed)
+    del missing['xyz']
+    short = dict(packed, sizes=packed['sizes'][:-4])
+    for bad in (missing, short, 42):
+        with pytest.raises(ValueError):
+            codec.decode_msgpack(codec.msgpack.packb(bad))
+    with pytest.raises(ValueError):
+        codec.decode_msgpack(codec.msgpack.packb(packed)[:-10])
+
+
+def test_v3d1_round_trip_single_record():
+    src = _scene()
+    decoded = codec.decode_v3d1(codec.encode_v3d1(src))
+    assert isinstance(decoded, dict)
+    _assert_same(_from_kwargs(decoded), src)
+
+
+def test_v3d1_round_trip_multi_record():
+    scenes = [_scene(4, 2), _scene(0, 3), _scene(5, 0)]
+    raw = codec.encode_v3d1(scenes)
+    decoded = codec.decode_payload(raw)
+    assert isinstance(decoded, list) and len(decoded) == 3
+    for kwargs, src in zip(decoded, scenes):
+        _assert_same(_from_kwargs(kwargs), src)
+
+
+def test_v3d1_truncated_or_corrupt_raises_value_error():
+    one = codec.encode_v3d1(_scene(3, 1))
+    with pytest.raises(ValueError, match='truncated V3D1 header'):
+        codec.decode_v3d1(one[:6])
+    with pytest.raises(ValueError, match='truncated V3D1 record'):
+        codec.decode_v3d1(one[:-1])
+    # a second record cut inside its header
+    with pytest.raises(ValueError, match='truncated V3D1 header'):
+        codec.decode_v3d1(one + one[:8])
+    with pytest.raises(ValueError, match='corrupt V3D1 payload'):
+        codec.decode_v3d1(b'V3D2' + one[4:])
+    with pytest.raises(ValueError, match='corrupt V3D1 payload'):
+        codec.decode_v3d1(one + b'XXXX' + one[4:])
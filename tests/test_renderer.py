@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('vtkmodules')
+
+from vtkmodules.vtkRenderingCore import vtkRenderWindow, vtkRenderWindowInteractor
+
+from v3d import renderer as renderer_mod
+from v3d.renderer import SceneRenderer
+from v3d.scene_model import SceneModel
+
+if not renderer_mod._HAVE_VTK:
+    pytest.skip('VTK rendering modules are not available', allow_module_level=True)
+
+
+class _CountingWindow:
+    # an offscreen render window whose Render() calls are counted, not drawn
+    def __init__(self):
+        self.rw = vtkRenderWindow()
+        self.rw.SetOffScreenRendering(1)
+        iren = vtkRenderWindowInteractor()
+        iren.SetRenderWindow(self.rw)
+        self.renders = 0
+
+    def Render(self):
+        self.renders += 1
+
+    def __getattr__(self, name):
+        return getattr(self.rw, name)
+
+
+class _FakeWidget:
+    def __init__(self):
+        self.window = _CountingWindow()
+
+    def GetRenderWindow(self):
+        return self.window
+
+    def height(self):
+        return 600
+
+
+@pytest.fixture
+def scene():
+    r = SceneRenderer(_FakeWidget())
+    m = SceneModel()
+    m.randomize(n_points=20, n_segments=3)
+    r.render(m)
+    return r, m
+
+
+def test_row_update_of_selected_point_keeps_highlight(scene, monkeypatch):
+    r, m = scene
+    r.selected_ids = [3]
+    r._update_selection_actor()
+    calls = []
+    orig = r.update_indices
+    monkeypatch.setattr(r, 'update_indices', lambda model, idx: (calls.append(list(idx)), orig(model, idx)))
+
+    m.update_points([3, 5], xyz=[[9, 9, 9], [-9, -9, -9]], sizes=[4, 4], rgba=[[0, 1, 0], [0, 0, 1]])
+    r.render(m)
+
+    # 2 of 20 rows: patched through update_indices, not the full diff
+    assert calls == [[3, 5]]
+    assert r._xyz_np[3].tolist() == [9, 9, 9]
+    assert r._xyz_np[5].tolist() == [-9, -9, -9]
+    scales, colors = renderer_mod.build_point_buffers(m.sizes, m.colors, 0.05)
+    assert np.allclose(r._orig_scales, scales)
+    assert np.array_equal(r._orig_colors, colors)
+    # the selected row keeps its highlight, the other row shows the new style
+    assert np.isclose(r._scales_np[3], scales[3] * 2.5)
+    assert r._colors_np[3].tolist() == [255, 0, 0]
+    assert np.isclose(r._scales_np[5], scales[5])
+    assert r._colors_np[5].tolist() == [0, 0, 255]
+
+
+def test_large_or_skipped_updates_use_the_full_diff(scene, monkeypatch):
+    r, m = scene
+    r.selected_ids = [0]
+    r._update_selection_actor()
+    calls = []
+    monkeypatch.setattr(r, 'update_indices', lambda model, idx: calls.append(idx))
+
+    # more than a quarter of the rows
+    idx = np.arange(6)
+    m.update_points(idx, xyz=np.full((6, 3), 7.0))
+    r.render(m)
+    # two updates between renders: updated_indices covers only the last one
+    m.update_points([10], xyz=[[1, 2, 3]])
+    m.update_points([11], xyz=[[4, 5, 6]])
+    r.render(m)
+
+    assert calls == []
+    assert np.array_equal(r._xyz_np, m.xyz)
+    assert r._colors_np[0].tolist() == [255, 0, 0]
+
+
+def test_render_without_changes_skips_render(scene):
+    r, m = scene
+    window = r.interactor_widget.window
+    before = window.renders
+    r.render(m)
+    assert window.renders == before
+    # an update that writes the same values is not drawn either
+    m.update_points([2], xyz=m.xyz[2:3].copy())
+    r.render(m)
+    assert window.renders == before
+    m.update_points([2], xyz=[[0, 0, 50]])
+    r.render(m)
+    assert window.renders == before + 1
@@ -1,6 +1,9 @@
 import os
 import json
 import tempfile
+import numpy as np
+import pytest
+from v3d import scene_model
 from v3d.scene_model import SceneModel
 
 
@@ -23,3 +26,176 @@ def test_randomize_and_export():
         assert len(loaded['segments']) == 3
     finally:
         os.remove(path)
+
+
+def test_set_from_dict_fills_columns():
+    m = SceneModel()
+    m.set_from_dict({
+        'points': [{'id': 'a', 'x': 1, 'y': 2, 'z': 3, 'size': 8, 'color': [1, 0, 0]},
+                   {'x': -1, 'y': 0, 'z': 0.5}],
+        'segments': [{'start': [0, 0, 0], 'end': [1, 1, 1], 'color': [0, 1, 0, 1], 'width': 2},
+                     {'start': [0, 0, 0]}],
+    })
+    assert m.counts == (2, 1)
+    assert m.xyz.shape == (2, 3) and m.xyz.dtype.name == 'float32'
+    assert m.xyz[0].tolist() == [1, 2, 3]
+    assert m.sizes.tolist() == [8, 6]
+    assert m.colors[0].tolist() == [1, 0, 0, 1]
+    assert m.colors[1].tolist() == [1, 1, 1, 1]
+    assert m.ids == ['a', None]
+    assert m.seg_end[0].tolist() == [1, 1, 1]
+    assert m.seg_widths.tolist() == [2]
+    # the incoming dicts are kept as the list-of-dicts view
+    assert m.points[0]['id'] == 'a'
+
+
+def test_set_from_arrays_builds_dicts_lazily():
+    m = SceneModel()
+    xyz = np.arange(6, dtype=np.float32).reshape(2, 3)
+    rgba = np.array([[255, 0, 0, 255], [0, 0, 255, 255]], dtype=np.uint8)
+    m.set_from_arrays(xyz, sizes=[4, 5], rgba=rgba,
+                      seg_start=[[0, 0, 0]], seg_end=[[1, 2, 3]])
+    assert m.counts == (2, 1)
+    assert m.points[1] == {'x': 3.0, 'y': 4.0, 'z': 5.0, 'size': 5.0, 'color': [0.0, 0.0, 1.0, 1.0]}
+    assert m.segments[0]['end'] == [1.0, 2.0, 3.0]
+    m.clear()
+    assert m.counts == (0, 0)
+    assert m.to_dict() == {'points': [], 'segments': []}
+
+
+def test_set_from_dict_coerces_and_rejects_once():
+    m = SceneModel()
+    m.set_from_dict({'points': [{'x': '1.5', 'y': 2, 'z': 3}, {'y': 1}]})
+    assert m.xyz.tolist() == [[1.5, 2, 3], [0, 1, 0]]
+    with pytest.raises(ValueError, match='invalid point data'):
+        m.set_from_dict({'points': [{'x': 'abc', 'y': 0, 'z': 0}]})
+    with pytest.raises(ValueError, match='invalid segment data'):
+        m.set_from_dict({'segments': [{'start': [0, 0, 0], 'end': ['a', 0, 0]}]})
+
+
+def test_set_from_dict_rejects_null_and_non_dict_entries():
+    m = SceneModel()
+    m.randomize(n_points=3, n_segments=2)
+    before = m.to_dict()
+    bad_points = [
+        [{'x': None, 'y': 0, 'z': 0}],
+        [{'x': 0, 'y': 0, 'z': 0, 'size': None}],
+        [{'x': 0, 'y': 0, 'z': 0, 'color': None}],
+        [[0, 0, 0]],
+        ['abc'],
+        None,
+    ]
+    for pts in bad_points:
+        with pytest.raises(ValueError, match='invalid point data'):
+            m.set_from_dict({'points': pts})
+    bad_segments = [
+        [{'start': [0, None, 0], 'end': [1, 1, 1]}],
+        [{'start': [0, 0, 0], 'end': [1, 1, 1], 'width': None}],
+        [{'start': [0, 0, 0], 'end': [1, 1, 1], 'color': None}],
+        [[0, 0, 0]],
+        [42],
+    ]
+    for segs in bad_segments:
+        with pytest.raises(ValueError, match='invalid segment data'):
+            m.set_from_dict({'points': [], 'segments': segs})
+    # rejected input leaves the scene untouched
+    assert m.to_dict() == before
+
+
+def test_load_json_in_batches(monkeypatch):
+    monkeypatch.setattr(scene_model, 'STREAM_MIN_BYTES', 0)
+    src = SceneModel()
+    src.randomize(n_points=25, n_segments=7)
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        src.export_json(path)
+        m = SceneModel()
+        m.load_json(path, batch_size=4)
+        assert m.counts == (25, 7)
+        assert np.allclose(m.xyz, src.xyz)
+        assert np.allclose(m.seg_end, src.seg_end)
+        assert m.ids == src.ids
+        assert len(m.points) == 25
+    finally:
+        os.remove(path)
+
+
+def test_load_json_keeps_scene_on_error(monkeypatch):
+    monkeypatch.setattr(scene_model, 'STREAM_MIN_BYTES', 0)
+    m = SceneModel()
+    m.randomize(n_points=5, n_segments=2)
+    before = m.to_dict()
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        pts = [{'x': i, 'y': 0, 'z': 0} for i in range(6)] + [{'x': None, 'y': 0, 'z': 0}]
+        with open(path, 'w') as f:
+            json.dump({'points': pts, 'segments': []}, f)
+        with pytest.raises(ValueError, match='invalid point data'):
+            m.load_json(path, batch_size=4)
+        assert m.to_dict() == before
+    finally:
+        os.remove(path)
+
+
+def test_load_json_rejects_non_array_sections(monkeypatch):
+    m = SceneModel()
+    m.randomize(n_points=5, n_segments=2)
+    before = m.to_dict()
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    seg = {'start': [0, 0, 0], 'end': [1, 1, 1]}
+    cases = [
+        ({'points': None, 'segments': [seg]}, 'invalid point data'),
+        ({'points': 'abc', 'segments': [seg]}, 'invalid point data'),
+        ({'points': [], 'segments': None}, 'invalid segment data'),
+        ({'points': [], 'segments': 42}, 'invalid segment data'),
+    ]
+    try:
+        # the one-shot and the streaming path agree on the same files
+        for min_bytes in (scene_model.STREAM_MIN_BYTES, 0):
+            monkeypatch.setattr(scene_model, 'STREAM_MIN_BYTES', min_bytes)
+            for data, match in cases:
+                with open(path, 'w') as f:
+                    json.dump(data, f)
+                with pytest.raises(ValueError, match=match):
+                    m.load_json(path)
+                assert m.to_dict() == before
+    finally:
+        os.remove(path)
+
+
+def test_iter_export_chunks_matches_to_dict():
+    m = SceneModel()
+    m.randomize(n_points=7, n_segments=5)
+    data = json.loads(b''.join(m.iter_export_chunks(chunk_rows=3)))
+    assert data == m.to_dict()
+    m.set_from_dict({'points': [{'x': 1, 'y': 2, 'z': 3, 'label': 'a'}], 'segments': []})
+    data = json.loads(b''.join(m.iter_export_chunks(chunk_rows=3)))
+    assert data == {'points': [{'x': 1, 'y': 2, 'z': 3, 'label': 'a'}], 'segments': []}
+    m.clear()
+    assert json.loads(b''.join(m.iter_export_chunks())) == {'points': [], 'segments': []}
+
+
+def test_update_points_and_diff():
+    m = SceneModel()
+    m.randomize(n_points=10, n_segments=2)
+    v = m.version
+    prev = m.copy()
+    m.update_points([2, 5], xyz=[[0, 0, 0], [1, 1, 1]], rgba=[[0, 0, 1], [0, 0, 1]])
+    assert m.version == v + 1
+    assert m.updated_indices.tolist() == [2, 5]
+    assert m.xyz[5].tolist() == [1, 1, 1] and m.colors[2].tolist() == [0, 0, 1, 1]
+    assert m.points[5]['x'] == 1
+    # the snapshot is unaffected by the in-place update
+    assert m.diff(prev).tolist() == [2, 5]
+
+    prev.update_from(m)
+    assert prev.updated_indices.tolist() == [2, 5]
+    assert prev.diff(m).tolist() == []
+    other = SceneModel()
+    other.randomize(n_points=4, n_segments=1)
+    assert other.diff(m) is None
+    prev.update_from(other)
+    assert prev.updated_indices is None and prev.counts == (4, 1)
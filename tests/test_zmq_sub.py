@@ -0,0 +1,49 @@
+import json
+import time
+
+import pytest
+
+zmq = pytest.importorskip('zmq')
+pytest.importorskip('PySide6')
+
+from PySide6 import QtCore
+
+from v3d.scene_model import SceneModel
+from v3d.zmq_sub import ZMQSubscriber
+
+
+def _publish_until(pub, payload, received, count, timeout=5.0):
+    # PUB/SUB drops messages until the subscription has propagated, so keep
+    # resending until the subscriber reports a new scene
+    deadline = time.monotonic() + timeout
+    while len(received) < count:
+        assert time.monotonic() < deadline, 'no scene received'
+        pub.send(payload)
+        time.sleep(0.02)
+
+
+def test_invalidate_applies_identical_payload_again():
+    pub = zmq.Context.instance().socket(zmq.PUB)
+    pub.setsockopt(zmq.LINGER, 0)
+    port = pub.bind_to_random_port('tcp://127.0.0.1')
+    sub = ZMQSubscriber(addr=f'tcp://127.0.0.1:{port}', poll_ms=20)
+    received = []
+    sub.scene_ready.connect(lambda n, m: received.append((n, m)), QtCore.Qt.DirectConnection)
+    sub.start()
+    try:
+        m = SceneModel()
+        m.randomize(n_points=4, n_segments=2)
+        payload = json.dumps(m.to_dict()).encode('utf-8')
+        _publish_until(pub, payload, received, 1)
+        model = SceneModel()
+        assert sub.buffer.read_into(model) == (4, 2)
+
+        # the GUI clears the scene; the heartbeat resend must repopulate it
+        model.clear()
+        sub.invalidate()
+        _publish_until(pub, payload, received, 2)
+        assert sub.buffer.read_into(model) == (4, 2)
+        assert model.counts == (4, 2)
+    finally:
+        sub.stop()
+        pub.close()
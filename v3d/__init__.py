@@ -1,8 +1,28 @@
 # v3d package initializer
+import importlib
+
 from .scene_model import SceneModel
-from .renderer import SceneRenderer
-from .zmq_sub import ZMQSubscriber
-from .ui import MainWindow, create_app
 __version__ = "0.1.0"
 
-__all__ = ["SceneModel", "SceneRenderer", "ZMQSubscriber", "MainWindow", "create_app", "__version__"]
\ No newline at end of file
+__all__ = ["SceneModel", "SceneRenderer", "ZMQSubscriber", "MainWindow", "create_app", "__version__"]
+
+# Qt/VTK-backed names are imported on first access (PEP 562), so model-only
+# users such as the tests do not pay for loading Qt and VTK.
+_LAZY = {
+    "SceneRenderer": ".renderer",
+    "ZMQSubscriber": ".zmq_sub",
+    "MainWindow": ".ui",
+    "create_app": ".ui",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,29 @@
+"""
+JSON encode/decode helpers, using orjson when it is installed.
+
+orjson is an optional dependency: it parses bytes and buffers directly (no
+decode to str first) and is considerably faster than the stdlib module. The
+stdlib ``json`` is used as a fallback with the same call signatures.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from bytes, a buffer (memoryview, zmq frame buffer) or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def dumpb(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
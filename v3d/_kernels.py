@@ -0,0 +1,91 @@
+"""
+Per-point buffer conversion for the renderer, optionally JIT-compiled.
+
+Numba is an optional dependency. When it is installed and the scene is large
+enough, the scale/color conversion runs as one fused compiled loop instead of
+several NumPy passes with temporaries; otherwise the NumPy path is used.
+"""
+import threading
+
+import numpy as np
+
+# below this point count the NumPy path wins over dispatching the kernel
+NUMBA_MIN_POINTS = 1000
+
+# compiled kernel (False when numba is missing or compilation failed); it is
+# built on a background thread so neither the slow numba import nor the JIT
+# compile blocks the caller, which uses the NumPy path until it is ready
+_kernel = None
+_warmup = None
+_warmup_lock = threading.Lock()
+
+# explicit signature: compiled eagerly, for the contiguous arrays passed below
+_KERNEL_SIG = 'void(float32[::1], float32[:, ::1], float32, float32[::1], uint8[:, ::1])'
+
+
+def _compile_kernel():
+    global _kernel
+    try:
+        from numba import njit
+    except ImportError:
+        _kernel = False
+        return
+
+    def _point_buffers_kernel(size_in, col_in, scale, scale_out, col_out):
+        for i in range(size_in.shape[0]):
+            scale_out[i] = size_in[i] * scale
+            for c in range(3):
+                v = col_in[i, c] * 255.0
+                if v < 0.0:
+                    v = 0.0
+                elif v > 255.0:
+                    v = 255.0
+                col_out[i, c] = np.uint8(v)
+
+    # serial on purpose: a parallel=True kernel compiled off the main thread
+    # hangs interpreter exit under numba's TBB threading layer
+    try:
+        # the on-disk cache makes later launches load instead of recompile
+        kernel = njit(_KERNEL_SIG, cache=True)(_point_buffers_kernel)
+    except Exception:
+        # no writable cache location (e.g. a frozen build): compile uncached
+        try:
+            kernel = njit(_KERNEL_SIG)(_point_buffers_kernel)
+        except Exception:
+            kernel = False
+    _kernel = kernel
+
+
+def warm_up():
+    """Start compiling the kernel in the background, if not already started."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = threading.Thread(target=_compile_kernel, name='v3d-numba-warmup', daemon=True)
+            _warmup.start()
+
+
+def _get_kernel():
+    """Return the compiled kernel, or False while it is not (yet) available."""
+    if _kernel is None:
+        warm_up()
+    return _kernel or False
+
+
+def build_point_buffers(sizes: np.ndarray, colors: np.ndarray, scale: float):
+    """Return (sizes * scale as float32 (N,), rgb as uint8 (N,3)).
+
+    sizes: (N,) float32 point sizes; colors: (N,4) float32 rgba in 0-1.
+    """
+    n = len(sizes)
+    kernel = _get_kernel() if n >= NUMBA_MIN_POINTS else False
+    if not kernel:
+        scales = (sizes * scale).astype(np.float32, copy=False)
+        rgb = np.clip(colors[:, :3] * 255, 0, 255).astype(np.uint8)
+        return scales, rgb
+    scale_out = np.empty(n, dtype=np.float32)
+    col_out = np.empty((n, 3), dtype=np.uint8)
+    kernel(np.ascontiguousarray(sizes, dtype=np.float32),
+           np.ascontiguousarray(colors, dtype=np.float32),
+           np.float32(scale), scale_out, col_out)
+    return scale_out, col_out
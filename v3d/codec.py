@@ -0,0 +1,167 @@
+"""
+Binary scene encodings shared by publishers and the ZMQ subscriber.
+
+V3D1 record: magic, '<II' point/segment counts, then little-endian float32
+xyz (N,3), sizes (N,), seg_start (M,3), seg_end (M,3), seg_widths (M,),
+then uint8 rgba (N,4) and seg_rgba (M,4). Floats come first so every array
+starts 4-byte aligned; a payload may hold several records back to back.
+V3D1 needs nothing beyond NumPy.
+
+msgpack column layout: each scene is a map of raw little-endian column
+buffers (xyz/sizes/seg_start/seg_end/seg_widths float32, rgba/seg_rgba
+uint8) plus the point / segment counts n and m, so the receiver can view
+them as NumPy arrays without parsing. A message holds one such map or a
+list of them.
+
+msgpack is an optional dependency; only the msgpack helpers need it.
+"""
+import struct
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from . import _json
+from .scene_model import SceneModel
+
+V3D1_MAGIC = b'V3D1'
+_V3D1_HEADER = struct.Struct('<4sII')
+# bytes per point (xyz, size, rgba) and per segment (start, end, width, rgba)
+_V3D1_POINT_BYTES = 4 * 3 + 4 + 4
+_V3D1_SEGMENT_BYTES = 4 * 3 * 2 + 4 + 4
+
+
+def _as_model(scene) -> SceneModel:
+    # accept a SceneModel or a points/segments scene dict
+    if isinstance(scene, SceneModel):
+        return scene
+    model = SceneModel()
+    model.set_from_dict(scene)
+    return model
+
+
+def _rgba_bytes(colors: np.ndarray) -> bytes:
+    # (N,4) float rgba in 0-1 -> (N,4) uint8 bytes
+    return np.rint(np.clip(colors, 0, 1) * 255).astype(np.uint8).tobytes()
+
+
+def _f4_bytes(arr: np.ndarray) -> bytes:
+    return np.ascontiguousarray(arr, dtype='<f4').tobytes()
+
+
+def pack_scene(scene) -> dict:
+    """Convert a scene (SceneModel or points/segments dict) to the msgpack column layout."""
+    model = _as_model(scene)
+    n, m = model.counts
+    return {
+        'n': n,
+        'xyz': _f4_bytes(model.xyz),
+        'sizes': _f4_bytes(model.sizes),
+        'rgba': _rgba_bytes(model.colors),
+        'm': m,
+        'seg_start': _f4_bytes(model.seg_start),
+        'seg_end': _f4_bytes(model.seg_end),
+        'seg_rgba': _rgba_bytes(model.seg_colors),
+        'seg_widths': _f4_bytes(model.seg_widths),
+    }
+
+
+def unpack_scene(d) -> dict:
+    """Turn a msgpack column-buffer scene into SceneModel.set_from_arrays kwargs.
+
+    The arrays are read-only views into the message buffers; a malformed
+    scene (missing keys, buffers that do not match n / m) raises ValueError.
+    """
+    try:
+        n, m = d['n'], d.get('m', 0)
+        return {
+            'xyz': np.frombuffer(d['xyz'], dtype='<f4').reshape(n, 3),
+            'sizes': np.frombuffer(d['sizes'], dtype='<f4').reshape(n),
+            'rgba': np.frombuffer(d['rgba'], dtype=np.uint8).reshape(n, 4),
+            'seg_start': np.frombuffer(d['seg_start'], dtype='<f4').reshape(m, 3),
+            'seg_end': np.frombuffer(d['seg_end'], dtype='<f4').reshape(m, 3),
+            'seg_rgba': np.frombuffer(d['seg_rgba'], dtype=np.uint8).reshape(m, 4),
+            'seg_widths': np.frombuffer(d['seg_widths'], dtype='<f4').reshape(m),
+        }
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f'corrupt msgpack scene: {e!r}') from e
+
+
+def encode_msgpack(scenes) -> bytes:
+    """Encode a scene, or a list of scenes, as one msgpack message."""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed')
+    if isinstance(scenes, (list, tuple)):
+        return msgpack.packb([pack_scene(sc) for sc in scenes])
+    return msgpack.packb(pack_scene(scenes))
+
+
+def decode_msgpack(raw):
+    """Decode a msgpack message into set_from_arrays kwargs (a list for batches)."""
+    if msgpack is None:
+        raise ValueError('binary payload received but msgpack is not installed')
+    msg = msgpack.unpackb(raw)
+    if isinstance(msg, list):
+        return [unpack_scene(d) for d in msg]
+    return unpack_scene(msg)
+
+
+def encode_v3d1(scenes) -> bytes:
+    """Encode a scene, or a list of scenes, as back-to-back V3D1 records."""
+    if not isinstance(scenes, (list, tuple)):
+        scenes = [scenes]
+    parts = []
+    for scene in scenes:
+        c = pack_scene(scene)
+        parts += (_V3D1_HEADER.pack(V3D1_MAGIC, c['n'], c['m']),
+                  c['xyz'], c['sizes'], c['seg_start'], c['seg_end'], c['seg_widths'],
+                  c['rgba'], c['seg_rgba'])
+    return b''.join(parts)
+
+
+def decode_v3d1(raw):
+    """Decode V3D1 records into set_from_arrays kwargs (views into raw, no copy).
+
+    Returns one kwargs dict, or a list of them for several records. A wrong
+    magic or a truncated header / record raises ValueError.
+    """
+    scenes = []
+    off, end = 0, len(raw)
+    while off < end:
+        if end - off < _V3D1_HEADER.size:
+            raise ValueError('truncated V3D1 header')
+        magic, n, m = _V3D1_HEADER.unpack_from(raw, off)
+        if magic != V3D1_MAGIC:
+            raise ValueError('corrupt V3D1 payload')
+        off += _V3D1_HEADER.size
+        if end - off < n * _V3D1_POINT_BYTES + m * _V3D1_SEGMENT_BYTES:
+            raise ValueError('truncated V3D1 record')
+        cols = {}
+        for key, dtype, count, shape in (
+                ('xyz', '<f4', n * 3, (n, 3)), ('sizes', '<f4', n, (n,)),
+                ('seg_start', '<f4', m * 3, (m, 3)), ('seg_end', '<f4', m * 3, (m, 3)),
+                ('seg_widths', '<f4', m, (m,)),
+                ('rgba', np.uint8, n * 4, (n, 4)), ('seg_rgba', np.uint8, m * 4, (m, 4))):
+            arr = np.frombuffer(raw, dtype=dtype, count=count, offset=off)
+            cols[key] = arr.reshape(shape)
+            off += arr.nbytes
+        scenes.append(cols)
+    return scenes[0] if len(scenes) == 1 else scenes
+
+
+def decode_payload(raw):
+    """Decode a message payload (bytes or buffer): V3D1, JSON text, or msgpack.
+
+    JSON payloads decode to the usual scene dict (or list of scene dicts);
+    V3D1 and msgpack scenes decode to dicts of NumPy column arrays keyed like
+    the SceneModel.set_from_arrays arguments.
+    """
+    if bytes(raw[:4]) == V3D1_MAGIC:
+        return decode_v3d1(raw)
+    head = bytes(raw[:1])
+    if head.isspace() or head in (b'{', b'['):
+        return _json.loads(raw)
+    return decode_msgpack(raw)
@@ -1,125 +1,164 @@
 """
 High-performance VTK renderer.
 
-Points are rendered using a single vtkPolyData + vtkGlyph3DMapper (batching),
+Points are rendered using a single vtkPolyData + vtkPointGaussianMapper drawing
+one screen-aligned sphere impostor per point (batching),
 and segments (lines) are rendered using a vtkPolyData with vtkCellArray.
 This reduces actor count and improves performance for large datasets.
 """
 from typing import Any
 
+import numpy as np
+
+from ._kernels import build_point_buffers
+
+# Import only the VTK modules we use: vtkmodules.all loads every VTK kit and
+# is a large part of application start-up time.
 try:
-    import vtkmodules.all as vtk
-    from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
-    from vtkmodules.util.numpy_support import numpy_to_vtk
+    from vtkmodules.vtkCommonCore import (
+        VTK_FLOAT, VTK_UNSIGNED_CHAR, vtkFloatArray, vtkIdList, vtkPoints, vtkUnsignedCharArray,
+    )
+    from vtkmodules.vtkCommonDataModel import (
+        vtkCellArray, vtkDataObject, vtkPointLocator, vtkPolyData, vtkSelectionNode,
+    )
+    from vtkmodules.vtkRenderingCore import (
+        vtkActor, vtkCellPicker, vtkHardwareSelector, vtkPointGaussianMapper, vtkPolyDataMapper, vtkRenderer,
+    )
+    from vtkmodules.vtkInteractionStyle import vtkInteractorStyleTrackballCamera
+    # registers the OpenGL implementations of the rendering classes above
+    import vtkmodules.vtkRenderingOpenGL2  # noqa: F401
+    from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
+    _HAVE_VTK = True
 except Exception:
-    vtk = None
-    QVTKRenderWindowInteractor = None
+    _HAVE_VTK = False
+
+
+# row updates touching at most this fraction of the points are patched
+# through update_indices instead of diffing the whole scene
+_SPARSE_UPDATE_FRACTION = 0.25
+
+# Fragment snippet for vtkPointGaussianMapper: discard outside the unit disc
+# and shade the remaining fragments as a sphere lit from the viewer.
+_SPHERE_SPLAT_SHADER = (
+    "//VTK::Color::Impl\n"
+    "float dist2 = dot(offsetVCVSOutput.xy, offsetVCVSOutput.xy);\n"
+    "if (dist2 > 1.0) {\n"
+    "  discard;\n"
+    "}\n"
+    "float nz = sqrt(1.0 - dist2);\n"
+    "ambientColor *= 0.3 + 0.7 * nz;\n"
+    "diffuseColor *= 0.3 + 0.7 * nz;\n"
+)
+
 
+def _make_point_mapper(poly):
+    # scale array values are sphere diameters, the splat radius is scale * factor
+    mapper = vtkPointGaussianMapper()
+    mapper.SetInputData(poly)
+    mapper.SetScaleArray('Scale')
+    mapper.SetScaleFactor(0.5)
+    mapper.SetSplatShaderCode(_SPHERE_SPLAT_SHADER)
+    mapper.EmissiveOff()
+    mapper.SetColorModeToDirectScalars()
+    return mapper
 
-def _to_uchar_rgb(color):
-    # accept [r,g,b,a] floats 0-1, return 3-uint8
-    return [int(max(0, min(1, c)) * 255) for c in color[:3]]
+
+def _to_uchar_rgb(colors):
+    # accept (N,4) rgba floats 0-1, return contiguous (N,3) uint8
+    return np.clip(colors[:, :3] * 255, 0, 255).astype(np.uint8)
 
 
 class SceneRenderer:
+    # grid polydata shared by all renderers, keyed by (extent, spacing)
+    _grid_cache = {}
+
     def __init__(self, interactor_widget: Any):
-        if vtk is None or QVTKRenderWindowInteractor is None:
+        if not _HAVE_VTK:
             raise RuntimeError('VTK is required for SceneRenderer')
 
         self.interactor_widget = interactor_widget
-        self.ren = vtk.vtkRenderer()
+        self.ren = vtkRenderer()
         rw = interactor_widget.GetRenderWindow()
         rw.AddRenderer(self.ren)
         self.iren = rw.GetInteractor()
         self.actors = []
 
         # set Trackball camera style
-        style = vtk.vtkInteractorStyleTrackballCamera()
+        style = vtkInteractorStyleTrackballCamera()
         self.iren.SetInteractorStyle(style)
 
         # prepare point pipeline (empty, will fill in render)
-        self.point_poly = vtk.vtkPolyData()
-        self.point_points = vtk.vtkPoints()
+        self.point_poly = vtkPolyData()
+        self.point_points = vtkPoints()
         self.point_poly.SetPoints(self.point_points)
 
-        self.point_scales = vtk.vtkFloatArray()
+        self.point_scales = vtkFloatArray()
         self.point_scales.SetName('Scale')
         self.point_poly.GetPointData().AddArray(self.point_scales)
 
-        self.point_colors = vtk.vtkUnsignedCharArray()
+        self.point_colors = vtkUnsignedCharArray()
         self.point_colors.SetNumberOfComponents(3)
         self.point_colors.SetName('Color')
         self.point_poly.GetPointData().SetScalars(self.point_colors)
 
-        # glyph mapper for spheres
-        self.sphere = vtk.vtkSphereSource()
-        self.sphere.SetThetaResolution(8)
-        self.sphere.SetPhiResolution(8)
-
-        self.glyph_mapper = vtk.vtkGlyph3DMapper()
-        self.glyph_mapper.SetInputData(self.point_poly)
-        self.glyph_mapper.SetSourceConnection(self.sphere.GetOutputPort())
-        self.glyph_mapper.ScalingOn()
-        self.glyph_mapper.SetScaleArray('Scale')
-        self.glyph_mapper.SetColorModeToDirectScalars()
+        # impostor spheres: one vertex per point instead of a tessellated glyph
+        self.point_mapper = _make_point_mapper(self.point_poly)
 
-        self.point_actor = vtk.vtkActor()
-        self.point_actor.SetMapper(self.glyph_mapper)
+        self.point_actor = vtkActor()
+        self.point_actor.SetMapper(self.point_mapper)
         self.ren.AddActor(self.point_actor)
         self.actors.append(self.point_actor)
 
-        # point locator for picking (built after points are set)
-        self.point_locator = vtk.vtkPointLocator()
-
-        # selection pipeline: points for selected indices
-        self.selection_points = vtk.vtkPoints()
-        self.selection_poly = vtk.vtkPolyData()
-        self.selection_poly.SetPoints(self.selection_points)
-
-        self.selection_scales = vtk.vtkFloatArray()
-        self.selection_scales.SetName('Scale')
-        self.selection_poly.GetPointData().AddArray(self.selection_scales)
-
-        self.selection_colors = vtk.vtkUnsignedCharArray()
-        self.selection_colors.SetNumberOfComponents(3)
-        self.selection_colors.SetName('Color')
-        self.selection_poly.GetPointData().SetScalars(self.selection_colors)
-
-        self.selection_glyph_mapper = vtk.vtkGlyph3DMapper()
-        self.selection_glyph_mapper.SetInputData(self.selection_poly)
-        self.selection_glyph_mapper.SetSourceConnection(self.sphere.GetOutputPort())
-        self.selection_glyph_mapper.ScalingOn()
-        self.selection_glyph_mapper.SetScaleArray('Scale')
-        self.selection_glyph_mapper.SetColorModeToDirectScalars()
-
-        self.selection_actor = vtk.vtkActor()
-        self.selection_actor.SetMapper(self.selection_glyph_mapper)
-        self.ren.AddActor(self.selection_actor)
-        self.actors.append(self.selection_actor)
+        # point locator for picking; rebuilt lazily by the first pick after
+        # the points moved, not on every update
+        self.point_locator = vtkPointLocator()
+        self._locator_dirty = True
 
+        # selection is drawn by highlighting the selected points in the main
+        # point arrays (see _update_selection_actor), so there is no second
+        # point mapper to evaluate every frame
         # track selected point ids
         self.selected_ids = []
 
-        # keep original per-point scales and colors so we can restore on deselect
-        self._orig_scales = []
-        self._orig_colors = []
+        # last rendered point positions (renderer-owned copy) and segment
+        # columns, used to detect what changed between renders
+        self._xyz_np = np.empty((0, 3), dtype=np.float32)
+        self._last_segs = None
+        # model and version shown by the last render (for the row-update path)
+        self._last_model = None
+        self._last_version = -1
+
+        # the camera is fitted to the scene on the first render and whenever
+        # the point count changes; otherwise the user's view is kept
+        self._camera_initialized = False
+        self._last_n = -1
+
+        # ndarrays backing point_scales / point_colors (set in render), plus
+        # the original per-point values so we can restore on deselect
+        self._scales_np = np.empty((0,), dtype=np.float32)
+        self._colors_np = np.empty((0, 3), dtype=np.uint8)
+        self._orig_scales = self._scales_np.copy()
+        self._orig_colors = self._colors_np.copy()
 
         # line actor placeholders
-        self.line_poly = vtk.vtkPolyData()
-        self.line_points = vtk.vtkPoints()
+        self.line_poly = vtkPolyData()
+        self.line_points = vtkPoints()
         self.line_poly.SetPoints(self.line_points)
-        self.lines_cells = vtk.vtkCellArray()
+        self.lines_cells = vtkCellArray()
         self.line_poly.SetLines(self.lines_cells)
 
-        self.line_colors = vtk.vtkUnsignedCharArray()
+        self.line_colors = vtkUnsignedCharArray()
         self.line_colors.SetNumberOfComponents(3)
         self.line_colors.SetName('Color')
         self.line_poly.GetCellData().SetScalars(self.line_colors)
 
-        self.line_mapper = vtk.vtkPolyDataMapper()
+        self.line_mapper = vtkPolyDataMapper()
         self.line_mapper.SetInputData(self.line_poly)
-        self.line_actor = vtk.vtkActor()
+        self.line_actor = vtkActor()
         self.line_actor.SetMapper(self.line_mapper)
+        # wide lines are rasterized by the OpenGL mapper's line shader (shaded
+        # as tubes) rather than expanded into tube geometry on the CPU
+        self.line_actor.GetProperty().SetRenderLinesAsTubes(True)
         self.ren.AddActor(self.line_actor)
         self.actors.append(self.line_actor)
 
@@ -130,15 +169,11 @@ class SceneRenderer:
 
     def clear(self):
         # clear point and line data
-        self.point_points.Reset()
-        self.point_scales.Reset()
-        self.point_colors.Reset()
-        self.point_poly.GetPointData().Modified()
-
-        self.line_points.Reset()
-        self.lines_cells.Reset()
-        self.line_colors.Reset()
-        self.line_poly.GetCellData().Modified()
+        empty = np.empty((0, 3), dtype=np.float32)
+        self._set_points(empty, np.empty((0,), dtype=np.float32), np.empty((0, 3), dtype=np.uint8))
+        self._set_lines(empty, empty, np.empty((0, 4), dtype=np.float32), np.empty((0,), dtype=np.float32))
+        self._last_segs = None
+        self._last_model = None
 
         self.interactor_widget.GetRenderWindow().Render()
 
@@ -147,175 +182,307 @@ class SceneRenderer:
 
         extent: half-extent in meters (draw lines from -extent to +extent)
         spacing: grid spacing in meters
+
+        The grid geometry is built once per (extent, spacing) and shared by
+        all renderers; each renderer gets its own mapper/actor.
         """
-        if vtk is None:
+        if not _HAVE_VTK:
             return None
-        pts = vtk.vtkPoints()
-        lines = vtk.vtkCellArray()
+        grid_poly = SceneRenderer._grid_cache.get((extent, spacing))
+        if grid_poly is None:
+            grid_poly = self._build_grid_poly(extent, spacing)
+            SceneRenderer._grid_cache[(extent, spacing)] = grid_poly
 
-        n_steps = int((2 * extent) / spacing)
-        # ensure inclusive endpoints
-        xs = [(-extent + i * spacing) for i in range(n_steps + 1)]
-        ys = xs
-
-        pid = 0
-        # horizontal lines (constant y, varying x)
-        for y in ys:
-            start_id = None
-            for x in xs:
-                pts.InsertNextPoint(float(x), float(y), 0.0)
-                if start_id is None:
-                    start_id = pid
-                pid += 1
-            # create polyline for this row
-            poly = vtk.vtkPolyLine()
-            poly.GetPointIds().SetNumberOfIds(len(xs))
-            for i in range(len(xs)):
-                poly.GetPointIds().SetId(i, start_id + i)
-            lines.InsertNextCell(poly)
-
-        # vertical lines (constant x, varying y)
-        for x in xs:
-            start_id = None
-            for y in ys:
-                pts.InsertNextPoint(float(x), float(y), 0.0)
-                if start_id is None:
-                    start_id = pid
-                pid += 1
-            poly = vtk.vtkPolyLine()
-            poly.GetPointIds().SetNumberOfIds(len(ys))
-            for i in range(len(ys)):
-                poly.GetPointIds().SetId(i, start_id + i)
-            lines.InsertNextCell(poly)
-
-        grid_poly = vtk.vtkPolyData()
-        grid_poly.SetPoints(pts)
-        grid_poly.SetLines(lines)
-
-        mapper = vtk.vtkPolyDataMapper()
+        mapper = vtkPolyDataMapper()
         mapper.SetInputData(grid_poly)
-        actor = vtk.vtkActor()
+        actor = vtkActor()
         actor.SetMapper(mapper)
         actor.GetProperty().SetColor(0.7, 0.7, 0.7)
         actor.GetProperty().SetLighting(False)
         actor.GetProperty().SetLineWidth(1)
         return actor
 
+    @staticmethod
+    def _build_grid_poly(extent, spacing):
+        n_steps = int((2 * extent) / spacing)
+        # ensure inclusive endpoints
+        xs = -extent + np.arange(n_steps + 1, dtype=np.float32) * spacing
+        lo, hi = xs[0], xs[-1]
+        n = len(xs)
+
+        # one 2-point line per row (constant y) and per column (constant x)
+        pts = np.zeros((4 * n, 3), dtype=np.float32)
+        pts[0:2 * n:2, 0] = lo
+        pts[1:2 * n:2, 0] = hi
+        pts[0:2 * n, 1] = np.repeat(xs, 2)
+        pts[2 * n::2, 1] = lo
+        pts[2 * n + 1::2, 1] = hi
+        pts[2 * n:, 0] = np.repeat(xs, 2)
+
+        n_lines = 2 * n
+        conn = np.column_stack([np.full(n_lines, 2), 2 * np.arange(n_lines), 2 * np.arange(n_lines) + 1])
+        lines = vtkCellArray()
+        lines.SetCells(n_lines, numpy_to_vtkIdTypeArray(conn.ravel().astype(np.int64), deep=True))
+
+        vpts = vtkPoints()
+        vpts.SetData(numpy_to_vtk(pts, deep=True, array_type=VTK_FLOAT))
+        grid_poly = vtkPolyData()
+        grid_poly.SetPoints(vpts)
+        grid_poly.SetLines(lines)
+        return grid_poly
+
     def render(self, model):
-        # batch points
-        pts = model.points
-        segs = model.segments
-
-        self.point_points.Reset()
-        self.point_scales.Reset()
-        self.point_colors.Reset()
-
-        # reset original lists
-        self._orig_scales = []
-        self._orig_colors = []
-
-        for p in pts:
-            x, y, z = float(p.get('x', 0)), float(p.get('y', 0)), float(p.get('z', 0))
-            idp = self.point_points.InsertNextPoint(x, y, z)
-            scale = float(p.get('size', 6)) * 0.05
-            self.point_scales.InsertNextValue(scale)
-            rgb = _to_uchar_rgb(p.get('color', [1, 1, 1, 1]))
-            self.point_colors.InsertNextTuple3(rgb[0], rgb[1], rgb[2])
-            # store originals so we can restore on deselect
-            self._orig_scales.append(scale)
-            self._orig_colors.append((rgb[0], rgb[1], rgb[2]))
+        """Show `model`, touching only what changed since the last render.
+
+        When the model's only change since the last render is an in-place
+        row update (SceneModel.updated_indices) on a small share of the
+        points, just those rows are patched (see update_indices). Otherwise,
+        with an unchanged point count, moved points are written in place and
+        sizes/colors are only re-uploaded when they differ; a render that
+        changes nothing skips Render() entirely.
+        """
+        idx = model.updated_indices
+        sparse = (model is self._last_model and model.version == self._last_version + 1
+                  and idx is not None and len(model.xyz) == len(self._xyz_np)
+                  and len(idx) <= _SPARSE_UPDATE_FRACTION * len(self._xyz_np))
+        self._last_model, self._last_version = model, model.version
+        if sparse:
+            self.update_indices(model, idx)
+            return
+
+        xyz = model.xyz
+        n = len(xyz)
+        scales, colors = build_point_buffers(model.sizes, model.colors, 0.05)
+
+        if n == len(self._xyz_np):
+            points_changed = self._update_points(xyz, scales, colors)
+        else:
+            self._set_points(xyz, scales, colors)
+            points_changed = True
+
+        segs = (model.seg_start, model.seg_end, model.seg_colors, model.seg_widths)
+        lines_changed = self._last_segs is None or not all(
+            np.array_equal(a, b) for a, b in zip(segs, self._last_segs))
+        if lines_changed:
+            self._set_lines(*segs)
+            self._last_segs = tuple(a.copy() for a in segs)
+
+        if not points_changed and not lines_changed:
+            return
+
+        if not self._camera_initialized or n != self._last_n:
+            self.ren.ResetCamera()
+            self._camera_initialized = True
+        self._last_n = n
+        self.interactor_widget.GetRenderWindow().Render()
+
+    def update_indices(self, model, indices):
+        """Rewrite only the given point rows from `model` and re-render.
+
+        Positions, sizes and colors of those rows are copied into the arrays
+        VTK already holds; the rest of the scene is not looked at. Rows that
+        already hold these values skip Render() entirely.
+        """
+        idx = np.asarray(indices, dtype=np.int64)
+        if not len(idx):
+            return
+        xyz = model.xyz[idx]
+        moved = bool(np.any(xyz != self._xyz_np[idx]))
+        if moved:
+            self._xyz_np[idx] = xyz
+            self.point_points.GetData().Modified()
+            self.point_points.Modified()
+            self._invalidate_locator()
+
+        scales, colors = build_point_buffers(model.sizes[idx], model.colors[idx], 0.05)
+        if not moved and (np.array_equal(scales, self._orig_scales[idx])
+                          and np.array_equal(colors, self._orig_colors[idx])):
+            return
+        self._orig_scales[idx] = scales
+        self._orig_colors[idx] = colors
+        # keep the selection highlight on selected rows
+        sel = np.isin(idx, self.selected_ids)
+        scales[sel] *= 2.5
+        colors[sel] = (255, 0, 0)
+        self._scales_np[idx] = scales
+        self._colors_np[idx] = colors
+        self.point_scales.Modified()
+        self.point_colors.Modified()
+        self.point_poly.Modified()
+        self.interactor_widget.GetRenderWindow().Render()
+
+    def _set_points(self, xyz, scales, colors):
+        # full rebuild: hand renderer-owned copies to VTK without a second
+        # copy (numpy_to_vtk keeps a reference to the ndarray)
+        self._xyz_np = xyz.copy()
+        self.point_points.SetData(numpy_to_vtk(self._xyz_np, deep=False, array_type=VTK_FLOAT))
+
+        self._scales_np = scales
+        self.point_scales = numpy_to_vtk(scales, deep=False, array_type=VTK_FLOAT)
+        self.point_scales.SetName('Scale')
+        self.point_poly.GetPointData().AddArray(self.point_scales)
+
+        self._colors_np = colors
+        self.point_colors = numpy_to_vtk(colors, deep=False, array_type=VTK_UNSIGNED_CHAR)
+        self.point_colors.SetName('Color')
+        self.point_poly.GetPointData().SetScalars(self.point_colors)
+
+        # store originals so we can restore on deselect
+        self._orig_scales = scales.copy()
+        self._orig_colors = colors.copy()
+
+        self._invalidate_locator()
+        # update selection actor (keep selection after re-render)
+        self._update_selection_actor()
 
+    def _update_points(self, xyz, scales, colors):
+        # same point count: patch the existing arrays, return True if anything changed
+        moved = np.any(xyz != self._xyz_np, axis=1)
+        restyled = not (np.array_equal(scales, self._orig_scales)
+                        and np.array_equal(colors, self._orig_colors))
+        if moved.any():
+            self._xyz_np[moved] = xyz[moved]
+            self.point_points.GetData().Modified()
+            self.point_points.Modified()
+            self._invalidate_locator()
+        if restyled:
+            self._orig_scales = scales.copy()
+            self._orig_colors = colors.copy()
+            # rewrites the selection-aware values into _scales_np/_colors_np
+            self._update_selection_actor()
+        elif moved.any():
+            self.point_poly.Modified()
+        return bool(moved.any()) or restyled
+
+    def _invalidate_locator(self):
         self.point_poly.Modified()
+        self._locator_dirty = True
 
-        # rebuild locator for picking
+    def _ensure_locator(self):
+        # (re)build locator for picking if the points changed since the last one
+        if not self._locator_dirty:
+            return
         try:
             self.point_locator.SetDataSet(self.point_poly)
             self.point_locator.BuildLocator()
         except Exception:
             pass
+        self._locator_dirty = False
+
+    def _set_lines(self, seg_start, seg_end, seg_colors, seg_widths):
+        # batch lines: interleave start/end into one (2M,3) position array and
+        # describe all cells with one legacy connectivity buffer
+        # [2, i0, i1, 2, i2, i3, ...], so the whole set is a handful of calls
+        m = len(seg_start)
+        pos = np.empty((2 * m, 3), dtype=np.float32)
+        pos[0::2] = seg_start
+        pos[1::2] = seg_end
+        self._line_xyz_np = pos
+        self.line_points.SetData(numpy_to_vtk(pos, deep=False, array_type=VTK_FLOAT))
+
+        conn = np.empty(3 * m, dtype=np.int64)
+        conn[0::3] = 2
+        conn[1::3] = np.arange(0, 2 * m, 2)
+        conn[2::3] = np.arange(1, 2 * m, 2)
+        self.lines_cells.SetCells(m, numpy_to_vtkIdTypeArray(conn))
+
+        self._line_colors_np = _to_uchar_rgb(seg_colors)
+        self.line_colors = numpy_to_vtk(self._line_colors_np, deep=False, array_type=VTK_UNSIGNED_CHAR)
+        self.line_colors.SetName('Color')
+        self.line_poly.GetCellData().SetScalars(self.line_colors)
 
-        # batch lines
-        self.line_points.Reset()
-        self.lines_cells.Reset()
-        self.line_colors.Reset()
-        pid = 0
-        for seg in segs:
-            s = seg.get('start')
-            e = seg.get('end')
-            if not s or not e:
-                continue
-            p0 = self.line_points.InsertNextPoint(float(s[0]), float(s[1]), float(s[2]))
-            p1 = self.line_points.InsertNextPoint(float(e[0]), float(e[1]), float(e[2]))
-            line = vtk.vtkLine()
-            line.GetPointIds().SetId(0, pid)
-            line.GetPointIds().SetId(1, pid+1)
-            self.lines_cells.InsertNextCell(line)
-            pid += 2
-            rgb = _to_uchar_rgb(seg.get('color', [1,1,1,1]))
-            self.line_colors.InsertNextTuple3(rgb[0], rgb[1], rgb[2])
+        # line width is per actor: use the widest segment
+        self.line_actor.GetProperty().SetLineWidth(float(seg_widths.max()) if m else 1.0)
 
+        self.line_points.Modified()
         self.line_poly.Modified()
-        # update selection actor (keep selection after re-render)
-        self._update_selection_actor()
 
-        # reset camera and render
+    def reset_camera(self):
+        """Fit the camera to the current scene and re-render."""
         self.ren.ResetCamera()
+        self._camera_initialized = True
         self.interactor_widget.GetRenderWindow().Render()
 
     def _update_selection_actor(self):
         # Update the main point arrays to reflect selection highlights and
-        # restore original values for deselected points.
-        n = self.point_points.GetNumberOfPoints()
+        # restore original values for deselected points. The VTK arrays are
+        # views of the ndarrays, so this is a few vector stores.
+        n = len(self._scales_np)
         # ensure orig arrays length matches; if not, rebuild from arrays
-        if len(self._orig_scales) != n:
-            try:
-                self._orig_scales = [self.point_scales.GetValue(i) for i in range(n)]
-            except Exception:
-                self._orig_scales = [0.05 for _ in range(n)]
-        if len(self._orig_colors) != n:
-            try:
-                self._orig_colors = [tuple(int(c) for c in self.point_colors.GetTuple(i)) for i in range(n)]
-            except Exception:
-                self._orig_colors = [(255, 255, 255) for _ in range(n)]
+        if len(self._orig_scales) != n or len(self._orig_colors) != n:
+            self._orig_scales = self._scales_np.copy()
+            self._orig_colors = self._colors_np.copy()
 
         # restore all to original
-        for i in range(n):
-            try:
-                self.point_scales.SetValue(i, float(self._orig_scales[i]))
-            except Exception:
-                pass
-            try:
-                r, g, b = self._orig_colors[i]
-                self.point_colors.SetTuple3(i, int(r), int(g), int(b))
-            except Exception:
-                pass
+        self._scales_np[:] = self._orig_scales
+        self._colors_np[:] = self._orig_colors
 
         # apply highlight (enlarge + red) for selected ids
-        for pid in list(self.selected_ids):
-            if pid < 0 or pid >= n:
-                continue
-            try:
-                new_scale = float(self._orig_scales[pid]) * 2.5
-                self.point_scales.SetValue(pid, new_scale)
-                self.point_colors.SetTuple3(pid, 255, 0, 0)
-            except Exception:
-                continue
+        sel = np.asarray(self.selected_ids, dtype=np.int64)
+        sel = sel[(sel >= 0) & (sel < n)]
+        self._scales_np[sel] = self._orig_scales[sel] * 2.5
+        self._colors_np[sel] = (255, 0, 0)
 
         # mark modified
+        self.point_scales.Modified()
+        self.point_colors.Modified()
         self.point_poly.Modified()
 
-    def pick_and_select(self, display_x: int, display_y: int, multi: bool = True):
-        """Pick nearest point from display coordinates (Qt coords) and add to selection.
+    def _hardware_pick(self, x: int, y: int, radius: int = 2):
+        """Return ids of points drawn within `radius` px of VTK display (x, y).
 
-        Returns selected point index or None.
+        Uses GPU picking (vtkHardwareSelector), which identifies the glyphs
+        actually hit in a single selection render. Returns None when hardware
+        selection is unavailable (e.g. some off-screen contexts).
         """
-        if vtk is None:
+        try:
+            w, h = self.ren.GetRenderWindow().GetSize()
+            sel = vtkHardwareSelector()
+            sel.SetRenderer(self.ren)
+            sel.SetArea(max(0, x - radius), max(0, y - radius),
+                        min(w - 1, x + radius), min(h - 1, y + radius))
+            sel.SetFieldAssociation(vtkDataObject.FIELD_ASSOCIATION_POINTS)
+            result = sel.Select()
+        except Exception:
             return None
-        # convert Qt y to VTK display y (origin at lower-left)
-        height = self.interactor_widget.height()
-        vtk_y = height - display_y
-
-        picker = vtk.vtkCellPicker()
+        if result is None:
+            return None
+        for i in range(result.GetNumberOfNodes()):
+            node = result.GetNode(i)
+            if node.GetProperties().Get(vtkSelectionNode.PROP()) is not self.point_actor:
+                continue
+            ids = node.GetSelectionList()
+            if ids is not None:
+                return [int(ids.GetValue(j)) for j in range(ids.GetNumberOfTuples())]
+        return []
+
+    def _screen_candidates(self, cids, x: float, y: float):
+        """Return (squared screen distance to (x, y), id) for each point id, nearest first."""
+        cids = np.asarray(cids, dtype=np.int64)
+        if len(cids) == 0:
+            return []
+        # world -> clip with one composite matrix, then clip -> display for
+        # all candidates at once (same mapping as vtkRenderer.WorldToDisplay)
+        cam = self.ren.GetActiveCamera()
+        mat = cam.GetCompositeProjectionTransformMatrix(self.ren.GetTiledAspectRatio(), -1, 1)
+        m = np.array([[mat.GetElement(i, j) for j in range(4)] for i in range(4)])
+        pos = np.c_[self._xyz_np[cids], np.ones(len(cids))]
+        clip = pos @ m.T
+        ndc = clip[:, :2] / clip[:, 3:]
+        vx0, vy0, vx1, vy1 = self.ren.GetViewport()
+        w, h = self.ren.GetRenderWindow().GetSize()
+        dpx = (ndc[:, 0] + 1.0) * 0.5 * (vx1 - vx0) * w + vx0 * w
+        dpy = (ndc[:, 1] + 1.0) * 0.5 * (vy1 - vy0) * h + vy0 * h
+        d2 = (dpx - x) ** 2 + (dpy - y) ** 2
+        order = np.argsort(d2)
+        return list(zip(d2[order].tolist(), cids[order].tolist()))
+
+    def _pick_nearby(self, display_x: int, vtk_y: int):
+        """Fallback picking: nearest point around the vtkCellPicker hit position.
+
+        Returns point index or None.
+        """
+        picker = vtkCellPicker()
         # increase tolerance to make picking easier
         picker.SetTolerance(0.01)
         ok = picker.Pick(display_x, vtk_y, 0, self.ren)
@@ -324,26 +491,17 @@ class SceneRenderer:
         # Prefer candidates within a small world-space radius, then pick
         # the one with smallest screen-space distance to the click.
         pid = -1
-        candidates = []
+        self._ensure_locator()
         try:
-            idlist = vtk.vtkIdList()
+            idlist = vtkIdList()
             search_radius = 4.0
             self.point_locator.FindPointsWithinRadius(search_radius, pick_pos, idlist)
-            for ii in range(idlist.GetNumberOfIds()):
-                cid = idlist.GetId(ii)
-                px, py, pz = self.point_points.GetPoint(cid)
-                # convert world -> display
-                self.ren.SetWorldPoint(px, py, pz, 1.0)
-                self.ren.WorldToDisplay()
-                dpx, dpy, _ = self.ren.GetDisplayPoint()
-                dxs = dpx - display_x
-                dys = dpy - vtk_y
-                candidates.append((dxs*dxs + dys*dys, cid))
+            cids = [idlist.GetId(ii) for ii in range(idlist.GetNumberOfIds())]
+            candidates = self._screen_candidates(cids, display_x, vtk_y)
         except Exception:
             candidates = []
 
         if candidates:
-            candidates.sort(key=lambda x: x[0])
             # threshold in pixels (20 px) — allow a larger tolerance for easier picking
             if candidates[0][0] > (20*20):
                 return None
@@ -363,6 +521,28 @@ class SceneRenderer:
             dist2 = dx*dx + dy*dy + dz*dz
             if dist2 > (2.0 * 2.0):
                 return None
+        return pid
+
+    def pick_and_select(self, display_x: int, display_y: int, multi: bool = True):
+        """Pick nearest point from display coordinates (Qt coords) and add to selection.
+
+        Returns selected point index or None.
+        """
+        if not _HAVE_VTK:
+            return None
+        # convert Qt y to VTK display y (origin at lower-left)
+        height = self.interactor_widget.height()
+        vtk_y = height - display_y
+
+        # GPU picking: if a glyph is under the cursor we're done (several can
+        # overlap there, take the one whose center is closest on screen)
+        hits = self._hardware_pick(display_x, vtk_y)
+        if hits:
+            pid = self._screen_candidates(hits, display_x, vtk_y)[0][1]
+        else:
+            pid = self._pick_nearby(display_x, vtk_y)
+            if pid is None:
+                return None
 
         # selection logic: if multi (Alt pressed) then toggle membership
         if not multi:
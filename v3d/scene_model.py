@@ -1,45 +1,434 @@
 """
 Scene data model: points and segments, export/import, random generation.
+
+Points and segments are stored column-wise (SoA) as NumPy arrays so the
+renderer can hand them to VTK without touching every element in Python:
+
+- points:   xyz (N,3) float32, sizes (N,) float32, colors (N,4) float32, ids
+- segments: seg_start / seg_end (M,3) float32, seg_colors (M,4) float32,
+  seg_widths (M,) float32
+
+The list-of-dicts form (``points`` / ``segments``) is kept as a lazily built
+view for backward compatibility.
 """
-import json
-import random
-from typing import List, Dict, Any
+import copy
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from . import _json
+
+_DEFAULT_SIZE = 6.0
+_DEFAULT_COLOR = (1.0, 1.0, 1.0, 1.0)
+_DEFAULT_WIDTH = 1.0
+
+# files at least this large are stream-parsed (when ijson is available):
+# slower than one-shot parsing but with a bounded working set
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _rgba_array(colors) -> np.ndarray:
+    # accept a sequence of [r,g,b(,a)] floats 0-1, return (N,4) float32
+    n = len(colors)
+    try:
+        arr = np.array(colors, dtype=np.float32)
+    except ValueError:
+        # ragged input (mixed rgb / rgba): pad row by row
+        arr = np.ones((n, 4), dtype=np.float32)
+        for i, c in enumerate(colors):
+            arr[i, :len(c[:4])] = c[:4]
+    return _as_rgba(arr, n)
+
+
+def _as_rgba(rgba, n: int) -> np.ndarray:
+    # accept (N,3|4) floats 0-1 or uint8 0-255, return (N,4) float32
+    if rgba is None:
+        return np.tile(np.asarray(_DEFAULT_COLOR, dtype=np.float32), (n, 1))
+    if n == 0:
+        return np.empty((0, 4), dtype=np.float32)
+    arr = np.asarray(rgba)
+    scale = 1.0 / 255.0 if arr.dtype == np.uint8 else 1.0
+    arr = arr.reshape(n, -1)[:, :4].astype(np.float32) * scale
+    if arr.shape[1] == 4:
+        return np.ascontiguousarray(arr)
+    out = np.ones((n, 4), dtype=np.float32)
+    out[:, :3] = arr[:, :3]
+    return out
+
+
+def _writable(arr: np.ndarray) -> np.ndarray:
+    # columns may be read-only views (e.g. of a received message buffer)
+    return arr if arr.flags.writeable else arr.copy()
+
 
 class SceneModel:
     def __init__(self):
-        self.points: List[Dict[str, Any]] = []
-        self.segments: List[Dict[str, Any]] = []
+        self._xyz = np.empty((0, 3), dtype=np.float32)
+        self._size = np.empty((0,), dtype=np.float32)
+        self._color = np.empty((0, 4), dtype=np.float32)
+        self._ids: List[Optional[Any]] = []
+
+        self._seg_start = np.empty((0, 3), dtype=np.float32)
+        self._seg_end = np.empty((0, 3), dtype=np.float32)
+        self._seg_color = np.empty((0, 4), dtype=np.float32)
+        self._seg_width = np.empty((0,), dtype=np.float32)
+
+        # lazily built list-of-dicts views (None until requested)
+        self._points: Optional[List[Dict[str, Any]]] = []
+        self._segments: Optional[List[Dict[str, Any]]] = []
+
+        # bumped on every change; updated_indices holds the point rows touched
+        # by the latest change when it was an in-place row update, else None
+        self.version = 0
+        self.updated_indices: Optional[np.ndarray] = None
+
+    def _touch(self, indices: Optional[np.ndarray] = None):
+        self.version += 1
+        self.updated_indices = indices
 
     def clear(self):
-        self.points = []
-        self.segments = []
+        self.set_from_arrays(np.empty((0, 3), dtype=np.float32))
+
+    def copy(self) -> 'SceneModel':
+        """Return a snapshot that later in-place updates of this model don't affect."""
+        other = copy.copy(self)
+        for name in ('_xyz', '_size', '_color', '_seg_start', '_seg_end', '_seg_color', '_seg_width'):
+            setattr(other, name, getattr(self, name).copy())
+        other._ids = list(self._ids)
+        return other
+
+    # --- column (SoA) access ---------------------------------------------
+    @property
+    def xyz(self) -> np.ndarray:
+        return self._xyz
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return self._size
+
+    @property
+    def colors(self) -> np.ndarray:
+        return self._color
+
+    @property
+    def ids(self) -> List[Optional[Any]]:
+        return self._ids
+
+    @property
+    def seg_start(self) -> np.ndarray:
+        return self._seg_start
+
+    @property
+    def seg_end(self) -> np.ndarray:
+        return self._seg_end
+
+    @property
+    def seg_colors(self) -> np.ndarray:
+        return self._seg_color
+
+    @property
+    def seg_widths(self) -> np.ndarray:
+        return self._seg_width
+
+    # --- list-of-dicts (AoS) view ----------------------------------------
+    def _point_dicts(self, lo: int = 0, hi: Optional[int] = None) -> List[Dict[str, Any]]:
+        sl = slice(lo, hi)
+        pts = []
+        for pid, (x, y, z), size, color in zip(self._ids[sl], self._xyz[sl].tolist(),
+                                               self._size[sl].tolist(), self._color[sl].tolist()):
+            pt = {'x': x, 'y': y, 'z': z, 'size': size, 'color': color}
+            if pid is not None:
+                pt = {'id': pid, **pt}
+            pts.append(pt)
+        return pts
+
+    def _segment_dicts(self, lo: int = 0, hi: Optional[int] = None) -> List[Dict[str, Any]]:
+        sl = slice(lo, hi)
+        return [
+            {'start': s, 'end': e, 'color': c, 'width': w}
+            for s, e, c, w in zip(self._seg_start[sl].tolist(), self._seg_end[sl].tolist(),
+                                  self._seg_color[sl].tolist(), self._seg_width[sl].tolist())
+        ]
+
+    @property
+    def points(self) -> List[Dict[str, Any]]:
+        if self._points is None:
+            self._points = self._point_dicts()
+        return self._points
+
+    @points.setter
+    def points(self, pts: List[Dict[str, Any]]):
+        self._set_points(pts)
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        if self._segments is None:
+            self._segments = self._segment_dicts()
+        return self._segments
+
+    @segments.setter
+    def segments(self, segs: List[Dict[str, Any]]):
+        self._set_segments(segs)
+
+    @staticmethod
+    def _coerce_points(pts: List[Dict[str, Any]]):
+        # coerce each column with one batch conversion; bad input raises once
+        # here instead of failing per point further down the pipeline
+        try:
+            n = len(pts)
+            try:
+                xyz = [(p['x'], p['y'], p['z']) for p in pts]
+            except KeyError:
+                # missing coordinates default to 0
+                xyz = [(p.get('x', 0.0), p.get('y', 0.0), p.get('z', 0.0)) for p in pts]
+            xyz = np.asarray(xyz, dtype=np.float32).reshape(n, 3)
+            size = np.asarray([p.get('size', _DEFAULT_SIZE) for p in pts], dtype=np.float32).reshape(n)
+            color = _rgba_array([p.get('color', _DEFAULT_COLOR) for p in pts])
+            ids = [p.get('id') for p in pts]
+            # None (JSON null) converts to NaN instead of raising
+            if not (np.isfinite(xyz).all() and np.isfinite(size).all() and np.isfinite(color).all()):
+                raise ValueError('non-finite value')
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f'invalid point data: {e}') from e
+        return xyz, size, color, ids
+
+    @staticmethod
+    def _coerce_segments(segs: List[Dict[str, Any]]):
+        try:
+            segs = [s for s in segs if s.get('start') and s.get('end')]
+            m = len(segs)
+            start = np.asarray([s['start'][:3] for s in segs], dtype=np.float32).reshape(m, 3)
+            end = np.asarray([s['end'][:3] for s in segs], dtype=np.float32).reshape(m, 3)
+            color = _rgba_array([s.get('color', _DEFAULT_COLOR) for s in segs])
+            width = np.asarray([s.get('width', _DEFAULT_WIDTH) for s in segs], dtype=np.float32).reshape(m)
+            if not (np.isfinite(start).all() and np.isfinite(end).all()
+                    and np.isfinite(color).all() and np.isfinite(width).all()):
+                raise ValueError('non-finite value')
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f'invalid segment data: {e}') from e
+        return segs, (start, end, color, width)
+
+    def _set_points(self, pts: List[Dict[str, Any]], coerced=None):
+        # coerced: the result of _coerce_points(pts), if the caller has it
+        self._xyz, self._size, self._color, self._ids = coerced or self._coerce_points(pts)
+        # the incoming dicts already are the AoS view (keeps extra attributes)
+        self._points = pts
+        self._touch()
+
+    def _set_segments(self, segs: List[Dict[str, Any]], coerced=None):
+        segs, cols = coerced or self._coerce_segments(segs)
+        self._seg_start, self._seg_end, self._seg_color, self._seg_width = cols
+        self._segments = segs
+        self._touch()
+
+    def update_points(self, indices, xyz=None, sizes=None, rgba=None):
+        """Overwrite the given point rows in place (same ids, same count).
+
+        xyz: (K,3), sizes: (K,), rgba: (K,3|4) for the K indices; omitted
+        columns are left alone. Records the rows in updated_indices so the
+        renderer can patch just those.
+        """
+        idx = np.asarray(indices, dtype=np.int64).reshape(-1)
+        if xyz is not None:
+            self._xyz = _writable(self._xyz)
+            self._xyz[idx] = np.asarray(xyz, dtype=np.float32).reshape(-1, 3)
+        if sizes is not None:
+            self._size = _writable(self._size)
+            self._size[idx] = np.asarray(sizes, dtype=np.float32).reshape(-1)
+        if rgba is not None:
+            self._color = _writable(self._color)
+            self._color[idx] = _as_rgba(rgba, len(idx))
+        self._points = None
+        self._touch(idx)
+
+    def diff(self, previous: 'SceneModel') -> Optional[np.ndarray]:
+        """Indices of points whose position, size or color differ from previous.
+
+        Returns None when the point counts differ (no row correspondence).
+        """
+        if len(self._xyz) != len(previous._xyz):
+            return None
+        changed = (np.any(self._xyz != previous._xyz, axis=1)
+                   | (self._size != previous._size)
+                   | np.any(self._color != previous._color, axis=1))
+        return np.flatnonzero(changed)
+
+    def update_from(self, other: 'SceneModel'):
+        """Take other's scene, patching changed point rows in place when possible.
+
+        When only point positions/sizes/colors changed, just those rows are
+        updated (see update_points); anything else replaces the whole scene.
+        """
+        idx = other.diff(self)
+        segs_same = all(np.array_equal(a, b) for a, b in (
+            (other._seg_start, self._seg_start), (other._seg_end, self._seg_end),
+            (other._seg_color, self._seg_color), (other._seg_width, self._seg_width)))
+        if idx is not None and segs_same and other._ids == self._ids:
+            if len(idx):
+                self.update_points(idx, other._xyz[idx], other._size[idx], other._color[idx])
+            return
+        self.set_from_arrays(other._xyz, sizes=other._size, rgba=other._color, ids=other._ids,
+                             seg_start=other._seg_start, seg_end=other._seg_end,
+                             seg_rgba=other._seg_color, seg_widths=other._seg_width)
 
     def set_from_dict(self, data: Dict[str, Any]):
-        self.points = data.get('points', []) if isinstance(data, dict) else []
-        self.segments = data.get('segments', []) if isinstance(data, dict) else []
+        pts = data.get('points', []) if isinstance(data, dict) else []
+        segs = data.get('segments', []) if isinstance(data, dict) else []
+        # coerce both before assigning either, so bad input leaves the scene as it was
+        pt_cols = self._coerce_points(pts)
+        seg_cols = self._coerce_segments(segs)
+        self._set_points(pts, pt_cols)
+        self._set_segments(segs, seg_cols)
+
+    def set_from_arrays(self, xyz, sizes=None, rgba=None, ids=None,
+                        seg_start=None, seg_end=None, seg_rgba=None, seg_widths=None):
+        """Replace the scene with column arrays.
+
+        xyz: (N,3) positions; sizes: (N,); rgba: (N,3|4) floats 0-1 or uint8.
+        seg_start / seg_end: (M,3); seg_rgba: (M,3|4); seg_widths: (M,).
+        Missing optional columns fall back to the same defaults as the dict form.
+        """
+        xyz = np.ascontiguousarray(xyz, dtype=np.float32).reshape(-1, 3)
+        n = len(xyz)
+        self._xyz = xyz
+        self._size = (np.full(n, _DEFAULT_SIZE, dtype=np.float32) if sizes is None
+                      else np.ascontiguousarray(sizes, dtype=np.float32).reshape(n))
+        self._color = _as_rgba(rgba, n)
+        self._ids = list(ids) if ids is not None else [None] * n
+        self._points = None
+
+        if seg_start is None or seg_end is None:
+            seg_start = seg_end = np.empty((0, 3), dtype=np.float32)
+        self._seg_start = np.ascontiguousarray(seg_start, dtype=np.float32).reshape(-1, 3)
+        self._seg_end = np.ascontiguousarray(seg_end, dtype=np.float32).reshape(-1, 3)
+        m = len(self._seg_start)
+        self._seg_color = _as_rgba(seg_rgba, m)
+        self._seg_width = (np.full(m, _DEFAULT_WIDTH, dtype=np.float32) if seg_widths is None
+                           else np.ascontiguousarray(seg_widths, dtype=np.float32).reshape(m))
+        self._segments = None
+        self._touch()
 
     def to_dict(self) -> Dict[str, Any]:
         return {'points': self.points, 'segments': self.segments}
 
+    def load_json(self, path: str, batch_size: int = 50000):
+        """Replace the scene with the contents of a JSON scene file.
+
+        Large files (STREAM_MIN_BYTES and up) are parsed as streams with
+        ijson when it is installed: points and segments are coerced to
+        columns in batches during a single pass, so the whole document is
+        never held as Python objects at once. Smaller files, or all files
+        without ijson, are parsed in one go. The scene is replaced only once
+        the whole file parsed; on error it is left as it was.
+        """
+        if ijson is None or os.path.getsize(path) < STREAM_MIN_BYTES:
+            with open(path, 'rb') as f:
+                data = _json.loads(f.read())
+            self.set_from_dict(data)
+            return
+        # coerced column chunks per section, concatenated once at the end
+        chunks = {'points.item': [], 'segments.item': []}
+        coerce = {'points.item': self._coerce_points,
+                  'segments.item': lambda segs: self._coerce_segments(segs)[1]}
+        batches = {'points.item': [], 'segments.item': []}
+
+        def add(section, item):
+            batch = batches[section]
+            batch.append(item)
+            if len(batch) >= batch_size:
+                chunks[section].append(coerce[section](batch))
+                batch.clear()
+
+        # one pass over the file; each array item is rebuilt from its events
+        sections = {'points': 'point', 'segments': 'segment'}
+        builder = section = None
+        with open(path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == section and event in ('end_map', 'end_array'):
+                        add(section, builder.value)
+                        builder = None
+                elif prefix in sections:
+                    # the top-level value itself: anything but an array is
+                    # rejected, as the one-shot path does
+                    if event not in ('start_array', 'end_array'):
+                        raise ValueError(f'invalid {sections[prefix]} data: '
+                                         f'expected an array, got {event}')
+                elif prefix in chunks:
+                    if event in ('start_map', 'start_array'):
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        section = prefix
+                    else:
+                        # a scalar item; coercion rejects it
+                        add(prefix, value)
+        for section, batch in batches.items():
+            # always one (possibly empty) chunk, so every column concatenates
+            chunks[section].append(coerce[section](batch))
+
+        def cat(section, i):
+            return np.concatenate([c[i] for c in chunks[section]])
+
+        # the file parsed cleanly: only now replace the current scene
+        self.set_from_arrays(cat('points.item', 0), sizes=cat('points.item', 1),
+                             rgba=cat('points.item', 2),
+                             ids=[i for c in chunks['points.item'] for i in c[3]],
+                             seg_start=cat('segments.item', 0), seg_end=cat('segments.item', 1),
+                             seg_rgba=cat('segments.item', 2), seg_widths=cat('segments.item', 3))
+
+    def iter_export_chunks(self, chunk_rows: int = 10000):
+        """Yield the to_dict() scene as compact JSON bytes, a slice at a time.
+
+        Rows are converted and encoded chunk_rows at a time, so exporting a
+        scene that only exists as columns never builds the full list-of-dicts
+        view or the full JSON text.
+        """
+        yield b'{"points":['
+        yield from self._iter_json_rows(self._points, len(self._xyz), self._point_dicts, chunk_rows)
+        yield b'],"segments":['
+        yield from self._iter_json_rows(self._segments, len(self._seg_start), self._segment_dicts, chunk_rows)
+        yield b']}'
+
+    @staticmethod
+    def _iter_json_rows(view, rows: int, build, chunk_rows: int):
+        # comma-separated JSON items of a list, without the brackets; taken
+        # from the AoS view when it exists, else built from the columns
+        for lo in range(0, rows, chunk_rows):
+            hi = lo + chunk_rows
+            items = view[lo:hi] if view is not None else build(lo, hi)
+            if lo:
+                yield b','
+            yield _json.dumpb(items)[1:-1]
+
     def export_json(self, path: str):
-        with open(path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        with open(path, 'wb') as f:
+            for chunk in self.iter_export_chunks():
+                f.write(chunk)
 
     def randomize(self, n_points: int = 20, n_segments: int = 5, bounds=((-5,5),(-5,5),(-2,2))):
-        self.clear()
+        rng = np.random.default_rng()
         bx, by, bz = bounds
-        for i in range(n_points):
-            x = random.uniform(*bx)
-            y = random.uniform(*by)
-            z = random.uniform(*bz)
-            pt = {'id': f'p{i}', 'x': x, 'y': y, 'z': z, 'size': random.uniform(4,10), 'color': [random.random(), random.random(), random.random(), 1.0]}
-            self.points.append(pt)
-        for i in range(n_segments):
-            s = random.choice(self.points)
-            e = random.choice(self.points)
-            seg = {'start': [s['x'], s['y'], s['z']], 'end': [e['x'], e['y'], e['z']], 'color': [random.random(), random.random(), random.random(), 1.0], 'width': 2}
-            self.segments.append(seg)
+        xyz = rng.uniform([bx[0], by[0], bz[0]], [bx[1], by[1], bz[1]], size=(n_points, 3))
+        sizes = rng.uniform(4, 10, n_points)
+        colors = rng.random((n_points, 4))
+        colors[:, 3] = 1.0
+        if n_points == 0:
+            n_segments = 0
+        # segment endpoints are picked among the generated points
+        idx = rng.integers(0, max(n_points, 1), (n_segments, 2))
+        seg_colors = rng.random((n_segments, 4))
+        seg_colors[:, 3] = 1.0
+        self.set_from_arrays(xyz, sizes=sizes, rgba=colors, ids=[f'p{i}' for i in range(n_points)],
+                             seg_start=xyz[idx[:, 0]], seg_end=xyz[idx[:, 1]], seg_rgba=seg_colors,
+                             seg_widths=np.full(n_segments, 2.0))
 
     @property
     def counts(self):
-        return len(self.points), len(self.segments)
+        return len(self._xyz), len(self._seg_start)
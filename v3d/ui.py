@@ -5,23 +5,65 @@ Provides buttons: Load, Clear, Generate Test Data, Export JSON, Start/Stop SUB.
 import sys
 import json
 import subprocess
+from collections import deque
 from PySide6 import QtCore, QtWidgets, QtGui
 
-try:
-    from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
-except Exception:
-    QVTKRenderWindowInteractor = None
-
 from .scene_model import SceneModel
-from .renderer import SceneRenderer
-from .zmq_sub import ZMQSubscriber
+from .zmq_sub import ZMQSubscriber, term_context
+
+# lines kept in the log view
+_LOG_LINES = 500
+
+
+def _load_qvtk_widget():
+    # VTK is imported when the window is built, not when this module is, so
+    # create_app() and the QApplication come up without waiting on it
+    try:
+        # register the OpenGL render window / default interactor style
+        # factories before the widget instantiates its vtkRenderWindow
+        import vtkmodules.vtkInteractionStyle  # noqa: F401
+        import vtkmodules.vtkRenderingOpenGL2  # noqa: F401
+        from vtkmodules.qt.QVTKRenderWindowInteractor import QVTKRenderWindowInteractor
+    except Exception:
+        return None
+    return QVTKRenderWindowInteractor
 
 
 def create_app(argv):
+    # only the VTK view needs a native window (with VTK's default QWidget
+    # base it draws into its own native child); leave its siblings (log,
+    # labels, controls) on the raster backing store
+    QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_DontCreateNativeWidgetSiblings)
     app = QtWidgets.QApplication(argv)
     return app
 
 
+class _IOSignals(QtCore.QObject):
+    done = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+
+class _IOWorker(QtCore.QRunnable):
+    """Run a file load/export callable on the global thread pool.
+
+    The result (or error text) is delivered through queued signals, so the
+    connected slots run on the GUI thread.
+    """
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _IOSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.done.emit(result)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -33,6 +75,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # LEFT: 3D view (VTK)
         left_widget = QtWidgets.QWidget()
         left_layout = QtWidgets.QVBoxLayout(left_widget)
+        QVTKRenderWindowInteractor = _load_qvtk_widget()
         if QVTKRenderWindowInteractor is None:
             # show a placeholder with clear install instructions when VTK is not available
             ph = QtWidgets.QWidget()
@@ -110,13 +153,25 @@ class MainWindow(QtWidgets.QMainWindow):
         mode_layout.addWidget(self.mode_select)
         right_layout.addWidget(mode_group)
 
-        # connect mode changes to update interaction
+        # connect mode changes to update interaction; the flag is read by the
+        # event filter on every mouse event
+        self._select_mode = False
         self.mode_browse.toggled.connect(self._on_mode_changed)
 
+        # View
+        view_group = QtWidgets.QGroupBox('View')
+        view_layout = QtWidgets.QHBoxLayout(view_group)
+        btn_reset_cam = QtWidgets.QPushButton('Reset Camera')
+        btn_reset_cam.clicked.connect(self.reset_camera)
+        view_layout.addWidget(btn_reset_cam)
+        right_layout.addWidget(view_group)
+
         # Info & log
         info_group = QtWidgets.QGroupBox('Info')
         info_layout = QtWidgets.QVBoxLayout(info_group)
         self.info_label = QtWidgets.QLabel('Points: 0    Segments: 0')
+        # counts currently shown, so unchanged updates skip setText
+        self._last_counts = (0, 0)
         info_layout.addWidget(self.info_label)
         self.selected_info = QtWidgets.QTextEdit()
         self.selected_info.setReadOnly(True)
@@ -126,15 +181,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
         log_group = QtWidgets.QGroupBox('Log')
         log_layout = QtWidgets.QVBoxLayout(log_group)
-        self.log = QtWidgets.QTextEdit()
+        self.log = QtWidgets.QPlainTextEdit()
         self.log.setReadOnly(True)
         self.log.setFixedHeight(200)
+        self.log.setMaximumBlockCount(_LOG_LINES)
         log_layout.addWidget(self.log)
+        # log lines are buffered and flushed to the view at 5 Hz, so bursts of
+        # status/receive messages don't relayout the document per line
+        self._log_pending = deque(maxlen=_LOG_LINES)
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setInterval(200)
+        self._log_timer.timeout.connect(self._flush_log, QtCore.Qt.DirectConnection)
+        self._log_timer.start()
         right_layout.addWidget(log_group, 1)
 
         bottom_h = QtWidgets.QHBoxLayout()
         bottom_h.addStretch()
         self.status = QtWidgets.QLabel('Ready')
+        self._last_status = None
         bottom_h.addWidget(self.status)
         right_layout.addLayout(bottom_h)
 
@@ -146,7 +210,19 @@ class MainWindow(QtWidgets.QMainWindow):
         # Model / renderer / zmq
         self.model = SceneModel()
         self.sub = None
+        # running file workers, kept referenced until they report back
+        self._io_workers = set()
+        # incoming scenes are coalesced: a scene arriving while idle is rendered
+        # on the next event-loop pass, later ones at most once per 16 ms tick
+        self._scene_pending = False
+        self._flush_posted = False
+        self._msg_timer = QtCore.QTimer(self)
+        self._msg_timer.setSingleShot(True)
+        self._msg_timer.setInterval(16)
+        # the timer lives on the GUI thread: call the slot directly
+        self._msg_timer.timeout.connect(self._flush_render, QtCore.Qt.DirectConnection)
         if self.vtk_widget is not None:
+            from .renderer import SceneRenderer
             self.renderer = SceneRenderer(self.vtk_widget)
         else:
             self.renderer = None
@@ -156,35 +232,90 @@ class MainWindow(QtWidgets.QMainWindow):
     
 
     # status/log helpers
+    @QtCore.Slot(str)
     def on_status(self, text: str):
+        # a repeat of the previous status (e.g. 'Scene updated' per tick)
+        # changes neither the label nor the log
+        if text == self._last_status:
+            return
+        self._last_status = text
         self.status.setText(text)
-        self.log.append(text)
+        self._log_pending.append(text)
+
+    @QtCore.Slot(str)
+    def on_log(self, text: str):
+        # log-only messages (e.g. subscriber diagnostics): the status stays
+        self._log_pending.append(text)
+
+    @QtCore.Slot()
+    def _flush_log(self):
+        if not self._log_pending:
+            return
+        self.log.appendPlainText('\n'.join(self._log_pending))
+        self._log_pending.clear()
 
     def _update_info(self):
-        p, s = self.model.counts
+        counts = self.model.counts
+        if counts == self._last_counts:
+            return
+        self._last_counts = counts
+        p, s = counts
         self.info_label.setText(f'Points: {p}    Segments: {s}')
 
     # actions
+    @QtCore.Slot()
     def load_json(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Open JSON', filter='*.json')
         if not path:
             return
-        try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            self.model.set_from_dict(data)
+
+        def load():
+            model = SceneModel()
+            model.load_json(path)
+            return path, model
+
+        self._start_io(load, self._on_loaded, 'Load error')
+        self.on_status(f'Loading: {path}')
+
+    def _start_io(self, fn, on_done, error_prefix):
+        worker = _IOWorker(fn)
+        self._io_workers.add(worker)
+
+        def finished():
+            self._io_workers.discard(worker)
+
+        worker.signals.done.connect(on_done)
+        worker.signals.failed.connect(lambda e: self.on_status(f'{error_prefix}: {e}'))
+        worker.signals.done.connect(finished)
+        worker.signals.failed.connect(finished)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    @QtCore.Slot(object)
+    def _on_loaded(self, result):
+        # file read and parsed on a worker: swap the new model in here
+        path, model = result
+        self.model = model
+        self._invalidate_sub()
+        if self.renderer is not None:
             self.renderer.render(self.model)
-            self._update_info()
-            self.on_status(f'Loaded: {path}')
-        except Exception as e:
-            self.on_status(f'Load error: {e}')
+        self._update_info()
+        self.on_status(f'Loaded: {path}')
 
+    def _invalidate_sub(self):
+        # the scene no longer matches the last received payload, so an
+        # identical resend (e.g. a heartbeat) must be applied again
+        if self.sub is not None:
+            self.sub.invalidate()
+
+    @QtCore.Slot()
     def clear_scene(self):
         self.model.clear()
+        self._invalidate_sub()
         self.renderer.clear()
         self._update_info()
         self.on_status('Cleared')
 
+    @QtCore.Slot()
     def generate_data(self):
         # open dialog to ask sizes
         dlg = QtWidgets.QDialog(self)
@@ -200,63 +331,77 @@ class MainWindow(QtWidgets.QMainWindow):
         if dlg.exec() != QtWidgets.QDialog.Accepted:
             return
         self.model.randomize(n_points=npts.value(), n_segments=nseg.value())
+        self._invalidate_sub()
         self.renderer.render(self.model)
         self._update_info()
         self.on_status('Generated random test data')
 
     def eventFilter(self, obj, event):
         # intercept right-clicks on vtk widget when in select mode
-        if obj is getattr(self, 'vtk_widget', None):
+        if self._select_mode and obj is self.vtk_widget:
             # Prevent VTK from starting right-button interactions (pan/zoom)
             # when in Select mode by consuming the press and move events.
-            if self.mode_select.isChecked():
-                if event.type() == QtCore.QEvent.MouseButtonPress and event.button() == QtCore.Qt.RightButton:
+            etype = event.type()
+            if etype == QtCore.QEvent.MouseMove:
+                # if right button is held, consume move to avoid interaction
+                if event.buttons() & QtCore.Qt.RightButton:
                     return True
-                if event.type() == QtCore.QEvent.MouseMove:
-                    # if right button is held, consume move to avoid interaction
-                    buttons = event.buttons()
-                    if buttons & QtCore.Qt.RightButton:
-                        return True
-                if event.type() == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.RightButton:
-                    if self.renderer is not None:
-                        pos = event.pos()
-                        # multi-select only when Ctrl is pressed. Alt may be grabbed
-                        # by some WMs, so prefer Ctrl and use global keyboard state.
-                        mods = QtWidgets.QApplication.keyboardModifiers()
-                        ctrl = bool(mods & QtCore.Qt.ControlModifier)
-                        pid = self.renderer.pick_and_select(pos.x(), pos.y(), multi=ctrl)
-                        if pid is not None:
-                            # show latest point attributes
-                            try:
-                                pt = self.model.points[pid]
-                                self.selected_info.setPlainText(json.dumps(pt, indent=2))
-                            except Exception:
-                                self.selected_info.setPlainText(str(pid))
+            elif etype == QtCore.QEvent.MouseButtonPress:
+                if event.button() == QtCore.Qt.RightButton:
                     return True
+            elif etype == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.RightButton:
+                if self.renderer is not None:
+                    pos = event.pos()
+                    # multi-select only when Ctrl is pressed. Alt may be grabbed
+                    # by some WMs, so prefer Ctrl and use global keyboard state.
+                    mods = QtWidgets.QApplication.keyboardModifiers()
+                    ctrl = bool(mods & QtCore.Qt.ControlModifier)
+                    pid = self.renderer.pick_and_select(pos.x(), pos.y(), multi=ctrl)
+                    if pid is not None:
+                        # show latest point attributes
+                        try:
+                            pt = self.model.points[pid]
+                            self.selected_info.setPlainText(json.dumps(pt, indent=2))
+                        except Exception:
+                            self.selected_info.setPlainText(str(pid))
+                return True
         return super().eventFilter(obj, event)
 
+    @QtCore.Slot(bool)
     def _on_mode_changed(self, checked: bool):
-        # checked == True means Browse selected; False means Select
-        if not hasattr(self, 'renderer') or self.renderer is None:
-            return
-        try:
-            # Do not change the interactor style here. Right-button interaction
-            # is suppressed via the event filter in Select mode so other
-            # interactions (left-button rotate, etc.) remain available.
+        # checked == True means Browse selected; False means Select.
+        # Do not change the interactor style here. Right-button interaction
+        # is suppressed via the event filter in Select mode so other
+        # interactions (left-button rotate, etc.) remain available.
+        self._select_mode = not checked
+
+    @QtCore.Slot()
+    def reset_camera(self):
+        if self.renderer is None:
             return
-        except Exception:
-            pass
+        self.renderer.reset_camera()
 
+    @QtCore.Slot()
     def export_json(self):
         path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Export JSON', filter='JSON files (*.json)')
         if not path:
             return
-        try:
-            self.model.export_json(path)
-            self.on_status(f'Exported scene to: {path}')
-        except Exception as e:
-            self.on_status(f'Export error: {e}')
+        # serialize a snapshot on a worker, so scenes arriving meanwhile
+        # don't race with it
+        snapshot = self.model.copy()
 
+        def export():
+            snapshot.export_json(path)
+            return path
+
+        self._start_io(export, self._on_exported, 'Export error')
+        self.on_status(f'Exporting: {path}')
+
+    @QtCore.Slot(object)
+    def _on_exported(self, path):
+        self.on_status(f'Exported scene to: {path}')
+
+    @QtCore.Slot()
     def toggle_sub(self):
         if self.sub and self.sub.isRunning():
             self.sub.stop()
@@ -270,27 +415,44 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         topic = self.topic_edit.text().encode('utf-8') if self.topic_edit.text().strip() else b''
         self.sub = ZMQSubscriber(addr=addr, topic=topic)
-        self.sub.msg_received.connect(self.on_msg)
-        self.sub.status.connect(self.on_status)
+        self.sub.scene_ready.connect(self.on_scene, QtCore.Qt.QueuedConnection)
+        self.sub.status.connect(self.on_status, QtCore.Qt.QueuedConnection)
+        self.sub.log.connect(self.on_log, QtCore.Qt.QueuedConnection)
         self.sub.start()
         self.btn_sub.setText('Stop SUB')
         self.on_status(f'Subscribing {addr}')
 
-    @QtCore.Slot(object)
-    def on_msg(self, msg):
+    @QtCore.Slot(int, int)
+    def on_scene(self, n_points, n_segments):
+        # last wins: the subscriber's buffer always holds the newest scene, so
+        # a burst of notifications within one tick is rendered once
+        self._scene_pending = True
+        if not self._msg_timer.isActive() and not self._flush_posted:
+            # idle: render from the event loop rather than inside this slot, so
+            # paint/input events queued meanwhile are handled first
+            self._flush_posted = True
+            QtCore.QTimer.singleShot(0, self._flush_render)
+
+    @QtCore.Slot()
+    def _flush_render(self):
+        self._flush_posted = False
+        if not self._scene_pending or self.sub is None:
+            return
+        self._scene_pending = False
+        # scenes arriving during the next tick wait for the timer
+        self._msg_timer.start()
         try:
-            self.log.append('[recv] ' + (json.dumps(msg) if not isinstance(msg, str) else msg))
-            if isinstance(msg, dict):
-                self.model.set_from_dict(msg)
+            n, m = self.sub.buffer.read_into(self.model)
+            self._log_pending.append(f'[recv] scene: {n} points, {m} segments')
+            if self.renderer is not None:
                 self.renderer.render(self.model)
-                self._update_info()
-                self.on_status('Scene updated (dict)')
-            else:
-                self.on_status('Received unknown message type')
+            self._update_info()
+            self.on_status('Scene updated')
         except Exception as e:
             self.on_status(f'Update error: {e}')
 
     def closeEvent(self, event):
         if self.sub:
             self.sub.stop()
+        term_context()
         super().closeEvent(event)
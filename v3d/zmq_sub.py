@@ -1,46 +1,258 @@
 """
 ZMQ subscriber running in a QThread and exposing Qt signals for integration with UI.
 """
-import json
+import time
 import traceback
 from PySide6 import QtCore
+import numpy as np
 import zmq
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from .codec import decode_payload
+from .scene_model import SceneModel
+
+
+def _payload_hash(buf) -> int:
+    # fast fingerprint of a raw payload, used to drop repeated scenes
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(buf)
+    return hash(memoryview(buf).toreadonly())
+
+
+class SceneBuffer:
+    """Latest scene columns, shared between the subscriber thread and the GUI.
+
+    The subscriber copies each new scene into preallocated arrays (grown by
+    doubling, so steady-state updates reuse the same memory) and only counts
+    cross the thread boundary; the GUI copies the slices out under the same
+    mutex.
+    """
+
+    def __init__(self):
+        self.mutex = QtCore.QMutex()
+        self.n = self.m = 0
+        self.ids = []
+        self.xyz = np.empty((0, 3), dtype=np.float32)
+        self.sizes = np.empty((0,), dtype=np.float32)
+        self.rgba = np.empty((0, 4), dtype=np.float32)
+        self.seg_start = np.empty((0, 3), dtype=np.float32)
+        self.seg_end = np.empty((0, 3), dtype=np.float32)
+        self.seg_rgba = np.empty((0, 4), dtype=np.float32)
+        self.seg_widths = np.empty((0,), dtype=np.float32)
+
+    def _reserve(self, n: int, m: int):
+        if n > len(self.xyz):
+            cap = max(n, 2 * len(self.xyz))
+            self.xyz = np.empty((cap, 3), dtype=np.float32)
+            self.sizes = np.empty((cap,), dtype=np.float32)
+            self.rgba = np.empty((cap, 4), dtype=np.float32)
+        if m > len(self.seg_start):
+            cap = max(m, 2 * len(self.seg_start))
+            self.seg_start = np.empty((cap, 3), dtype=np.float32)
+            self.seg_end = np.empty((cap, 3), dtype=np.float32)
+            self.seg_rgba = np.empty((cap, 4), dtype=np.float32)
+            self.seg_widths = np.empty((cap,), dtype=np.float32)
+
+    def write(self, scene: SceneModel):
+        n, m = scene.counts
+        with QtCore.QMutexLocker(self.mutex):
+            self._reserve(n, m)
+            self.xyz[:n] = scene.xyz
+            self.sizes[:n] = scene.sizes
+            self.rgba[:n] = scene.colors
+            self.seg_start[:m] = scene.seg_start
+            self.seg_end[:m] = scene.seg_end
+            self.seg_rgba[:m] = scene.seg_colors
+            self.seg_widths[:m] = scene.seg_widths
+            self.ids = scene.ids
+            self.n, self.m = n, m
+
+    def read_into(self, model: SceneModel):
+        """Update model to a copy of the buffered scene; returns (n, m).
+
+        Goes through SceneModel.update_from, so a scene that only moved or
+        restyled some points reaches the renderer as a row update.
+        """
+        scene = SceneModel()
+        with QtCore.QMutexLocker(self.mutex):
+            n, m = self.n, self.m
+            scene.set_from_arrays(self.xyz[:n].copy(), sizes=self.sizes[:n].copy(),
+                                  rgba=self.rgba[:n].copy(), ids=self.ids,
+                                  seg_start=self.seg_start[:m].copy(), seg_end=self.seg_end[:m].copy(),
+                                  seg_rgba=self.seg_rgba[:m].copy(), seg_widths=self.seg_widths[:m].copy())
+        model.update_from(scene)
+        return n, m
+
+
+def _scene_from_msg(msg) -> SceneModel:
+    # coerce a decoded scene (dict form or column arrays) into a model
+    if not isinstance(msg, dict):
+        raise ValueError(f'unknown message type {type(msg).__name__}')
+    scene = SceneModel()
+    if 'xyz' in msg:
+        scene.set_from_arrays(**msg)
+    else:
+        scene.set_from_dict(msg)
+    return scene
+
+
+# v3d's own context, shared by every subscriber run; kept separate from
+# zmq.Context.instance() so term_context() never waits on sockets held by
+# other users of the global context
+_ctx = None
+
+
+def _context():
+    global _ctx
+    if _ctx is None or _ctx.closed:
+        _ctx = zmq.Context()
+    return _ctx
+
+
+def term_context():
+    """Terminate v3d's ZMQ context; call once at process exit."""
+    global _ctx
+    if _ctx is not None:
+        _ctx.term()
+        _ctx = None
+
+
 class ZMQSubscriber(QtCore.QThread):
-    msg_received = QtCore.Signal(object)
+    # one emit per drain: the newest scene was written to `buffer`; carries
+    # its (point, segment) counts
+    scene_ready = QtCore.Signal(int, int)
     status = QtCore.Signal(str)
+    # diagnostics for the log only; never shown as the status
+    log = QtCore.Signal(str)
 
-    def __init__(self, addr: str = 'tcp://127.0.0.1:5556', topic: bytes = b'', poll_ms: int = 200):
+    def __init__(self, addr: str = 'tcp://127.0.0.1:5556', topic: bytes = b'', poll_ms: int = 200,
+                 rcvhwm: int = 16, max_msg_size: int = 64 * 1024 * 1024, report_s: float = 5.0):
         super().__init__()
         self.addr = addr
         self.topic = topic
         self.poll_ms = poll_ms
+        # backpressure: only a few messages queue at the socket, and oversized
+        # ones are refused there instead of being decoded
+        self.rcvhwm = rcvhwm
+        self.max_msg_size = max_msg_size
+        # how often (seconds) the coalesced-scene count is logged
+        self.report_s = report_s
+        self.buffer = SceneBuffer()
+        # stop() wakes the poller through this inproc PAIR endpoint
+        self._ctrl_addr = f'inproc://v3d-sub-ctrl-{id(self):x}'
         self._running = True
+        # set by invalidate(); the next payload is applied even if unchanged
+        self._invalidated = False
 
     def run(self):
+        sock = ctrl = None
         try:
-            ctx = zmq.Context()
+            # the module context (and its I/O thread) outlives restarts; only
+            # the socket is per run
+            ctx = _context()
             sock = ctx.socket(zmq.SUB)
             sock.setsockopt(zmq.SUBSCRIBE, self.topic)
+            sock.setsockopt(zmq.RCVHWM, self.rcvhwm)
+            sock.setsockopt(zmq.MAXMSGSIZE, self.max_msg_size)
+            # close() returns at once and never holds up the final ctx.term()
+            sock.setsockopt(zmq.LINGER, 0)
             sock.connect(self.addr)
+            ctrl = ctx.socket(zmq.PAIR)
+            ctrl.setsockopt(zmq.LINGER, 0)
+            ctrl.bind(self._ctrl_addr)
             poller = zmq.Poller()
             poller.register(sock, zmq.POLLIN)
+            poller.register(ctrl, zmq.POLLIN)
             self.status.emit(f"ZMQ connected -> {self.addr}")
+            last_hash = None
+            # scenes received but superseded by a newer one in the same drain:
+            # intentional coalescing, not loss, so it is only logged
+            coalesced = reported = 0
+            next_report = time.monotonic() + self.report_s
             while self._running:
                 socks = dict(poller.poll(self.poll_ms))
+                if ctrl in socks:
+                    break
+                now = time.monotonic()
+                if now >= next_report:
+                    if coalesced != reported:
+                        self.log.emit(f"ZMQ coalesced={coalesced} superseded scenes")
+                        reported = coalesced
+                    next_report = now + self.report_s
                 if sock in socks and socks[sock] == zmq.POLLIN:
-                    raw = sock.recv()
-                    try:
-                        msg = json.loads(raw.decode('utf-8'))
-                        self.msg_received.emit(msg)
-                    except Exception as e:
-                        self.status.emit(f"Bad message: {e}")
-            sock.close()
-            ctx.term()
+                    # drain everything already queued before polling again
+                    batch = []
+                    while self._running:
+                        try:
+                            frames = sock.recv_multipart(zmq.NOBLOCK, copy=False)
+                        except zmq.Again:
+                            break
+                        # [topic, payload] from topic-framed publishers (already filtered
+                        # by SUBSCRIBE), [payload] from single-frame ones; the payload
+                        # zmq.Frame is parsed straight from its buffer
+                        raw = frames[-1].buffer
+                        # identical payload (e.g. a heartbeat resend): nothing to update,
+                        # unless the GUI replaced the scene since it was last applied
+                        if self._invalidated:
+                            self._invalidated = False
+                            last_hash = None
+                        h = _payload_hash(raw)
+                        if h == last_hash:
+                            continue
+                        last_hash = h
+                        try:
+                            msg = decode_payload(raw)
+                        except Exception as e:
+                            self.status.emit(f"Bad message: {e}")
+                            continue
+                        # batched publishers send a list of scenes per message
+                        if isinstance(msg, list):
+                            batch.extend(msg)
+                        else:
+                            batch.append(msg)
+                    if batch:
+                        # only the newest scene is handed over; coercing it here
+                        # keeps dict traversal off the GUI thread
+                        coalesced += len(batch) - 1
+                        try:
+                            scene = _scene_from_msg(batch[-1])
+                        except Exception as e:
+                            self.status.emit(f"Bad message: {e}")
+                            continue
+                        self.buffer.write(scene)
+                        self.scene_ready.emit(*scene.counts)
         except Exception as e:
             self.status.emit(f"ZMQ thread error: {e}")
             traceback.print_exc()
+        finally:
+            # on every exit path: term_context() only returns once all sockets
+            # on the shared context are closed
+            for s in (sock, ctrl):
+                if s is not None:
+                    s.close()
+
+    def invalidate(self):
+        """Forget the last applied payload; call after replacing the scene locally.
+
+        Safe to call from any thread: the next received payload is handed over
+        even if it is identical to the previous one.
+        """
+        self._invalidated = True
 
     def stop(self):
         self._running = False
-        self.wait(500)
+        if self.isRunning():
+            # interrupt poller.poll() instead of waiting out poll_ms
+            wake = _context().socket(zmq.PAIR)
+            wake.setsockopt(zmq.LINGER, 0)
+            wake.connect(self._ctrl_addr)
+            try:
+                wake.send(b'x', zmq.NOBLOCK)
+            except zmq.Again:
+                pass
+            wake.close()
+        self.wait()